@@ -73,7 +73,9 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
+    # Callers running several commands in one process (run_migration.py repl)
+    # can hand in a shared engine instead of building one per command
+    connectable = config.attributes.get("engine") or engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
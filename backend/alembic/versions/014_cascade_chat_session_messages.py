@@ -0,0 +1,41 @@
+"""cascade chat session deletes to their messages
+
+Revision ID: 014_cascade_chat_session_messages
+Revises: 013_add_notifications_table
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_cascade_chat_session_messages'
+down_revision = '013_add_notifications_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Messages whose session no longer exists are unreachable through the API
+    # and would block the new constraint
+    op.execute("""
+        DELETE FROM public.session_chat_messages m
+        WHERE NOT EXISTS (
+            SELECT 1 FROM public.chat_sessions s WHERE s.id = m.session_id
+        )
+    """)
+    
+    # Let a single DELETE on chat_sessions remove the session's messages
+    op.execute("""
+        ALTER TABLE public.session_chat_messages
+        ADD CONSTRAINT fk_session_chat_messages_session FOREIGN KEY (session_id)
+            REFERENCES public.chat_sessions(id) ON DELETE CASCADE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE public.session_chat_messages
+        DROP CONSTRAINT IF EXISTS fk_session_chat_messages_session
+    """)
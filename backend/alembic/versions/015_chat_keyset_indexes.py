@@ -0,0 +1,37 @@
+"""add keyset pagination indexes for chat sessions and messages
+
+Revision ID: 015_chat_keyset_indexes
+Revises: 014_cascade_chat_session_messages
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015_chat_keyset_indexes'
+down_revision = '014_cascade_chat_session_messages'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match ORDER BY updated_at DESC, id DESC so (updated_at, id) < cursor is a range scan
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_sessions_user_updated_id
+            ON public.chat_sessions (user_id, updated_at DESC, id DESC)
+        """)
+    
+    # CONCURRENTLY is not supported on partitioned tables
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_session_chat_user_created_id
+        ON public.session_chat_messages (user_id, created_at DESC, id DESC)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.idx_session_chat_user_created_id")
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS public.idx_chat_sessions_user_updated_id")
@@ -0,0 +1,39 @@
+"""add partial composite indexes for notification feeds
+
+Revision ID: 016_notification_feed_indexes
+Revises: 015_chat_keyset_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016_notification_feed_indexes'
+down_revision = '015_chat_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every read filters on recipient + is_deleted = false and orders by
+    # created_at DESC, so partial indexes in that order avoid the sort step
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notif_recipient_feed
+            ON notifications (recipient_type, recipient_id, created_at DESC, id DESC)
+            WHERE is_deleted = false
+        """)
+        # Unread list/count hot path
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notif_recipient_unread
+            ON notifications (recipient_type, recipient_id, created_at DESC)
+            WHERE is_deleted = false AND is_read = false
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notif_recipient_unread")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notif_recipient_feed")
@@ -0,0 +1,32 @@
+"""store notification metadata as jsonb
+
+Revision ID: 017_notification_metadata_jsonb
+Revises: 016_notification_feed_indexes
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017_notification_metadata_jsonb'
+down_revision = '016_notification_feed_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE notifications
+        ALTER COLUMN metadata_json TYPE JSONB
+        USING NULLIF(metadata_json, '')::jsonb
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE notifications
+        ALTER COLUMN metadata_json TYPE TEXT
+        USING metadata_json::text
+    """)
@@ -0,0 +1,39 @@
+"""store notification timestamps as timestamptz
+
+Revision ID: 018_notification_timestamptz
+Revises: 017_notification_metadata_jsonb
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018_notification_timestamptz'
+down_revision = '017_notification_metadata_jsonb'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('created_at', 'updated_at', 'read_at', 'expires_at')
+
+
+def upgrade() -> None:
+    # Existing values were written as naive UTC
+    op.execute(
+        "ALTER TABLE notifications "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE TIMESTAMPTZ USING {column} AT TIME ZONE 'UTC'"
+            for column in COLUMNS
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE notifications "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE TIMESTAMP USING {column} AT TIME ZONE 'UTC'"
+            for column in COLUMNS
+        )
+    )
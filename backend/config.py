@@ -28,6 +28,7 @@ class Settings:
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-southeast-2")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "sentilex-evidence-vault-2026")
     S3_SIGNATURE_VERSION: str = "s3v4"  # Use AWS Signature Version 4
+    S3_UPLOAD_CONCURRENCY: int = int(os.getenv("S3_UPLOAD_CONCURRENCY", "10"))  # Parallel multipart parts
     
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -65,6 +66,7 @@ class Settings:
     PASSWORD_REQUIRE_UPPERCASE: bool = os.getenv("PASSWORD_REQUIRE_UPPERCASE", "true").lower() in ("1", "true", "yes")
     PASSWORD_REQUIRE_NUMBER: bool = os.getenv("PASSWORD_REQUIRE_NUMBER", "true").lower() in ("1", "true", "yes")
     PASSWORD_HISTORY_COUNT: int = int(os.getenv("PASSWORD_HISTORY_COUNT", "5"))
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Lower (e.g. 4) only for test/CI
     
     # Account Security
     MAX_LOGIN_ATTEMPTS: int = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
@@ -79,6 +81,7 @@ class Settings:
     SMTP_USER: str = os.getenv("SMTP_USER", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() in ("1", "true", "yes")
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", "2"))  # Long-lived SMTP connections reused across emails
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", "noreply@sentilex.lk")
     EMAIL_FROM_NAME: str = os.getenv("EMAIL_FROM_NAME", "SentiLex AI Advocate")
     
@@ -17,7 +17,12 @@ DB_DRIVER = os.getenv("DB_DRIVER", "postgresql+psycopg2")
 
 DATABASE_URL = f"{DB_DRIVER}://{DB_USER}:{quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes"))
+engine = create_engine(
+    DATABASE_URL,
+    echo=os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes"),
+    # Batch multi-row INSERTs (e.g. chat exchanges) into one statement with RETURNING
+    insertmanyvalues_page_size=1000
+)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -41,6 +41,7 @@ from routers import chat
 from routers import notifications
 from routers import stats
 from mcp_server.mcp_client import get_mcp_client
+from services.websocket_manager import start_notification_subscriber
 
 
 
@@ -76,6 +77,9 @@ async def lifespan(app: FastAPI):
             print("WARNING: MCP service not available")
     except Exception as e:
         print(f"WARNING: Could not connect to MCP service: {e}")
+    
+    # Relay notifications published by other workers (no-op without Redis)
+    start_notification_subscriber()
     yield  # The app runs while this is held
 
     # --- Shutdown Logic (Optional) ---
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, TIMESTAMP, Enum, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, TIMESTAMP, Enum, Index, func, text
 from sqlalchemy.types import TypeDecorator, VARCHAR
+from sqlalchemy.dialects.postgresql import JSONB
 import enum
 from database.config import Base
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class RecipientTypeEnum(str, enum.Enum):
@@ -51,25 +52,33 @@ class Notification(Base):
     
     # State management
     is_read = Column(Boolean, nullable=False, default=False, index=True)
-    read_at = Column(TIMESTAMP, nullable=True)
+    read_at = Column(TIMESTAMP(timezone=True), nullable=True)
     is_deleted = Column(Boolean, nullable=False, default=False, index=True)  # Soft delete
     
     # Timestamps
-    created_at = Column(TIMESTAMP, nullable=False, default=func.now(), index=True)
-    updated_at = Column(TIMESTAMP, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=func.now(), index=True)
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
     
     # Optional metadata for extensibility
-    metadata_json = Column(Text, nullable=True)  # JSON string for additional data
+    metadata_json = Column(JSONB(none_as_null=True), nullable=True)  # Additional data, stored as native JSONB; None is SQL NULL
     action_url = Column(String(500), nullable=True)  # Deep link for actions
     priority = Column(Integer, nullable=False, default=1)  # 1=low, 2=medium, 3=high
-    expires_at = Column(TIMESTAMP, nullable=True)  # For time-sensitive notifications
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=True)  # For time-sensitive notifications
     
     # Composite indexes for performance
     __table_args__ = (
-        # Most common query patterns
+        # Most common query patterns (migration 016): recipient feed and the
+        # unread list/count, both newest first over non-deleted rows
+        Index('ix_notif_recipient_feed', recipient_type, recipient_id, created_at.desc(), id.desc(),
+              postgresql_where=text("is_deleted = false")),
+        Index('ix_notif_recipient_unread', recipient_type, recipient_id, created_at.desc(),
+              postgresql_where=text("is_deleted = false AND is_read = false")),
         {'mysql_engine': 'InnoDB'},
     )
     
+    # Fetch server-generated values (id, timestamps) in the INSERT itself
+    __mapper_args__ = {'eager_defaults': True}
+    
     def __repr__(self):
         return f"<Notification(id={self.id}, recipient={self.recipient_type}:{self.recipient_id}, type={self.type})>"
     
@@ -77,7 +86,7 @@ class Notification(Base):
         """Mark notification as read with timestamp"""
         if not self.is_read:
             self.is_read = True
-            self.read_at = datetime.utcnow()
+            self.read_at = datetime.now(timezone.utc)
     
     def soft_delete(self) -> None:
         """Soft delete the notification"""
@@ -93,6 +102,10 @@ class Notification(Base):
         """Check if notification has expired"""
         if self.expires_at is None:
             return False
-        return datetime.utcnow() > self.expires_at
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            # Values passed in by callers may still be naive UTC
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) > expires_at
 
 
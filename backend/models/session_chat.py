@@ -19,7 +19,7 @@ class SessionChatMessage(Base):
     __tablename__ = 'session_chat_messages'
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    session_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    session_id = Column(UUID(as_uuid=True), ForeignKey('chat_sessions.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     role = Column(String(20), nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
@@ -32,10 +32,14 @@ class SessionChatMessage(Base):
     __table_args__ = (
         Index('ix_session_chat_messages_session_time', 'session_id', 'created_at'),
         Index('ix_session_chat_messages_user_time', 'user_id', 'created_at'),
+        Index('idx_session_chat_user_created_id', user_id, created_at.desc(), id.desc()),
         Index('ix_session_chat_messages_metadata', 'metadata', postgresql_using='gin'),
         {'extend_existing': True}
     )
     
+    # Populate server-generated columns from INSERT ... RETURNING
+    __mapper_args__ = {'eager_defaults': True}
+    
     def __repr__(self):
         return f"<SessionChatMessage(id={self.id}, session={self.session_id}, role={self.role})>"
 
@@ -61,6 +65,7 @@ class ChatSession(Base):
     
     __table_args__ = (
         Index('ix_chat_sessions_user_updated', 'user_id', 'updated_at'),
+        Index('idx_chat_sessions_user_updated_id', user_id, updated_at.desc(), id.desc()),
     )
     
     def __repr__(self):
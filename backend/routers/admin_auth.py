@@ -7,12 +7,14 @@ from models.token_blacklist import TokenBlacklist
 from models.active_session import ActiveSession
 from utils.auth import (
     hash_password, verify_password,
-    create_access_token, create_refresh_token, decode_token
+    create_access_token, create_refresh_token, decode_token,
+    generate_backup_codes
 )
 from auth.dependencies import get_current_active_user
 from schemas.auth import LoginResponse, UserProfile, MessageResponse
-from schemas.admin import AdminLogin, AdminProfile
+from schemas.admin import AdminLogin, AdminLoginMFA, AdminProfile
 from datetime import datetime, timedelta
+from typing import Optional
 import pyotp
 import qrcode
 from io import BytesIO
@@ -25,17 +27,9 @@ from config import settings
 
 router = APIRouter(prefix="/admin/auth", tags=["Admin Authentication"])
 
-@router.post("/login", response_model=LoginResponse)
-async def admin_login(
-    credentials: AdminLogin,
-    request: Request,
-    db: Session = Depends(get_db)
-):
-    """Admin login - requires MFA"""
-    
-    ip_address = request.client.host
-    user_agent = request.headers.get("user-agent")
-    
+
+def _authenticate_admin(credentials: AdminLogin, db: Session) -> Admin:
+    """Check admin credentials and that the account can log in with MFA"""
     # Find admin
     admin = db.query(Admin).filter(Admin.email == credentials.email).first()
     
@@ -58,6 +52,100 @@ async def admin_login(
             detail="MFA setup required for admin accounts. Contact system administrator."
         )
     
+    return admin
+
+
+def _verify_mfa_code(user, code: str, db: Session) -> None:
+    """Accept a TOTP code or consume a backup code, else raise"""
+    totp = pyotp.TOTP(user.mfa_secret)
+    is_valid = totp.verify(code)
+    
+    # If TOTP fails, check backup codes
+    if not is_valid and user.mfa_backup_codes:
+        backup_codes = user.mfa_backup_codes.split(",")
+        if code in backup_codes:
+            is_valid = True
+            # Remove used backup code
+            backup_codes.remove(code)
+            user.mfa_backup_codes = ",".join(backup_codes)
+            db.commit()
+    
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid MFA code"
+        )
+
+
+def _start_session(
+    user,
+    role: str,
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+    db: Session
+) -> LoginResponse:
+    """Issue full tokens and record the session after a successful MFA check"""
+    # Create full session tokens
+    access_token = create_access_token({"sub": str(user.id), "role": role})
+    refresh_token = create_refresh_token({"sub": str(user.id)})
+    
+    # Decode to get JTI
+    refresh_payload = decode_token(refresh_token)
+    
+    # Store active session
+    session = ActiveSession(
+        user_id=user.id,
+        jti=refresh_payload["jti"],
+        user_type="admin" if role in ["admin", "superadmin"] else "user",
+        ip_address=ip_address or "unknown",
+        user_agent=user_agent or "unknown",
+        expires_at=datetime.utcfromtimestamp(refresh_payload["exp"])
+    )
+    db.add(session)
+    
+    # Update last login
+    user.last_login = datetime.utcnow()
+    if isinstance(user, Admin):
+        user.last_login_ip = ip_address or "unknown"
+        user.last_login_user_agent = user_agent or "unknown"
+    db.commit()
+    
+    # Determine user type
+    if role in ["admin", "superadmin"]:
+        user_type = "admin"
+        name = user.full_name
+    else:
+        user_type = "user" if role == "user" else "lawyer"
+        name = f"{user.first_name} {user.last_name}" if hasattr(user, 'first_name') else user.full_name if hasattr(user, 'full_name') else user.email
+    
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+        expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        user_type=user_type,
+        requires_mfa=False,
+        mfa_enabled=True,
+        user_id=user.id,
+        email=user.email,
+        name=name,
+        role=role if role in ["admin", "superadmin"] else None
+    )
+
+
+@router.post("/login", response_model=LoginResponse)
+async def admin_login(
+    credentials: AdminLogin,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Admin login - requires MFA"""
+    
+    ip_address = request.client.host
+    user_agent = request.headers.get("user-agent")
+    
+    admin = _authenticate_admin(credentials, db)
+    
     # Return temporary token for MFA verification
     temp_token = create_access_token(
         data={"sub": str(admin.id), "type": "mfa_required", "role": admin.role.value},
@@ -107,7 +195,7 @@ async def setup_mfa(
     qr_code_base64 = base64.b64encode(buffer.getvalue()).decode()
     
     # Generate backup codes
-    backup_codes = [pyotp.random_base32()[:8] for _ in range(10)]
+    backup_codes = generate_backup_codes()
     
     # Store secret temporarily (don't enable until verified)
     current_user.mfa_secret = secret
@@ -180,72 +268,28 @@ async def verify_mfa(
             detail="MFA not enabled"
         )
     
-
-    totp = pyotp.TOTP(user.mfa_secret)
-    is_valid = totp.verify(mfa_data.code)
-    
-    # If TOTP fails, check backup codes
-    if not is_valid and user.mfa_backup_codes:
-        backup_codes = user.mfa_backup_codes.split(",")
-        if mfa_data.code in backup_codes:
-            is_valid = True
-            # Remove used backup code
-            backup_codes.remove(mfa_data.code)
-            user.mfa_backup_codes = ",".join(backup_codes)
-            db.commit()
-    
-    if not is_valid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid MFA code"
-        )
-    
-    # Create full session tokens
-    access_token = create_access_token({"sub": str(user.id), "role": role})
-    refresh_token = create_refresh_token({"sub": str(user.id)})
+    _verify_mfa_code(user, mfa_data.code, db)
     
-    # Decode to get JTI
-    refresh_payload = decode_token(refresh_token)
-    
-    # Store active session
-    session = ActiveSession(
-        user_id=user.id,
-        jti=refresh_payload["jti"],
-        user_type="admin" if role in ["admin", "superadmin"] else "user",
-        ip_address=mfa_data.ip_address or "unknown",
-        user_agent=mfa_data.user_agent or "unknown",
-        expires_at=datetime.utcfromtimestamp(refresh_payload["exp"])
-    )
-    db.add(session)
+    return _start_session(user, role, mfa_data.ip_address, mfa_data.user_agent, db)
+
+
+@router.post("/login-mfa", response_model=LoginResponse)
+async def admin_login_mfa(
+    credentials: AdminLoginMFA,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Single-step admin login: password and MFA code in one request, skipping
+    the temporary token round trip of /login + /mfa/verify.
+    """
+    ip_address = request.client.host
+    user_agent = request.headers.get("user-agent")
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    if isinstance(user, Admin):
-        user.last_login_ip = mfa_data.ip_address or "unknown"
-        user.last_login_user_agent = mfa_data.user_agent or "unknown"
-    db.commit()
+    admin = _authenticate_admin(credentials, db)
+    _verify_mfa_code(admin, credentials.code, db)
     
-    # Determine user type
-    if role in ["admin", "superadmin"]:
-        user_type = "admin"
-        name = user.full_name
-    else:
-        user_type = "user" if role == "user" else "lawyer"
-        name = f"{user.first_name} {user.last_name}" if hasattr(user, 'first_name') else user.full_name if hasattr(user, 'full_name') else user.email
-    
-    return LoginResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user_type=user_type,
-        requires_mfa=False,
-        mfa_enabled=True,
-        user_id=user.id,
-        email=user.email,
-        name=name,
-        role=role if role in ["admin", "superadmin"] else None
-    )
+    return _start_session(admin, admin.role.value, ip_address, user_agent, db)
 
 @router.post("/mfa/disable", response_model=MessageResponse)
 async def disable_mfa(
@@ -289,7 +333,7 @@ async def regenerate_backup_codes(
         )
     
     # Generate new backup codes
-    backup_codes = [pyotp.random_base32()[:8] for _ in range(10)]
+    backup_codes = generate_backup_codes()
     current_user.mfa_backup_codes = ",".join(backup_codes)
     db.commit()
     
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status,Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status,Request
 from sqlalchemy.orm import Session
 from database.config import get_db
 from models.user import User
@@ -38,7 +38,7 @@ from schemas.auth import (
     UserRegister, UserLogin, TokenResponse, TokenRefresh,
     PasswordReset, PasswordResetConfirm, PasswordChange,
     EmailVerification, UserProfile, LoginResponse,
-    RegistrationResponse, LogoutResponse, MessageResponse,
+    RegistrationResponse, LogoutResponse, MessageResponse, PasswordChangeResponse,
     ActiveSessionsResponse, SessionInfo,
     MFASetupResponse, MFAEnable, MFAVerify, MFADisable, MFAStatus
 )
@@ -46,7 +46,8 @@ from utils.auth import (
     hash_password, verify_password,
     create_access_token, create_refresh_token, decode_token,
     generate_verification_token, generate_password_reset_token,
-    check_password_history, update_password_history
+    check_password_history, update_password_history,
+    generate_backup_codes
 )
 
 from utils.email import (
@@ -69,6 +70,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 async def register(
     user_data: UserRegister,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Register a new user"""
@@ -101,7 +103,7 @@ async def register(
     #Send verification email
     verification_token = generate_verification_token(new_user.email)
     user_name = f"{new_user.first_name} {new_user.last_name}"
-    send_verification_email(new_user.email, verification_token, user_name)
+    background_tasks.add_task(send_verification_email, new_user.email, verification_token, user_name)
 
     return RegistrationResponse(
         message="Registration successful. Please verify your email.",
@@ -380,6 +382,7 @@ async def revoke_session(
 @router.post("/verify-email", response_model=MessageResponse)
 async def verify_email(
     verification: EmailVerification,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Verify user email"""
@@ -404,12 +407,13 @@ async def verify_email(
     user.email_verified = True
     db.commit()
     user_name = f"{user.first_name} {user.last_name}"
-    send_welcome_email(user.email, user_name)
+    background_tasks.add_task(send_welcome_email, user.email, user_name)
     
     return MessageResponse(message="Email verified successfully")
 
 @router.post("/resend-verification", response_model=MessageResponse)
 async def resend_verification_email(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -425,14 +429,15 @@ async def resend_verification_email(
     # Generate new verification token and send email
     verification_token = generate_verification_token(current_user.email)
     user_name = f"{current_user.first_name} {current_user.last_name}"
-    send_verification_email(current_user.email, verification_token, user_name)
+    background_tasks.add_task(send_verification_email, current_user.email, verification_token, user_name)
     
     return MessageResponse(message="Verification email sent successfully")
 
-@router.post("/change-password", response_model=MessageResponse)
+@router.post("/change-password", response_model=PasswordChangeResponse)
 async def change_password(
     password_data: PasswordChange,
     request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -467,16 +472,25 @@ async def change_password(
     current_user.password_changed_at = datetime.utcnow()
     db.commit()
     
+    # Re-issue an access token with the same claims as login so the client
+    # doesn't need another /login round trip after the change
+    new_access_token = create_access_token(data={"sub": str(current_user.id), "role": current_user.role})
+    
     #Send password change notification email
     user_name = f"{current_user.first_name} {current_user.last_name}"
     ip_address = request.client.host
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    send_password_changed_email(current_user.email, user_name, ip_address, timestamp)
-    return MessageResponse(message="Password changed successfully")
+    background_tasks.add_task(send_password_changed_email, current_user.email, user_name, ip_address, timestamp)
+    return PasswordChangeResponse(
+        message="Password changed successfully",
+        new_access_token=new_access_token,
+        expires_in=config.settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
 
 @router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_password(
     reset_data: PasswordReset,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Request password reset"""
@@ -489,7 +503,7 @@ async def forgot_password(
         #Send password reset email
         reset_token = generate_password_reset_token(user.email)
         user_name = f"{user.first_name} {user.last_name}"
-        send_password_reset_email(user.email, reset_token, user_name)
+        background_tasks.add_task(send_password_reset_email, user.email, reset_token, user_name)
     
     
     return MessageResponse(
@@ -499,6 +513,7 @@ async def forgot_password(
 @router.post("/reset-password", response_model=MessageResponse)
 async def reset_password(
     reset_data: PasswordResetConfirm,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Reset password with token"""
@@ -548,7 +563,7 @@ async def reset_password(
     #Send password reset confirmation email
     user_name = f"{user.first_name} {user.last_name}"
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    send_password_changed_email(user.email, user_name, "Password Reset", timestamp)
+    background_tasks.add_task(send_password_changed_email, user.email, user_name, "Password Reset", timestamp)
     
     return MessageResponse(message="Password reset successfully")
 
@@ -585,7 +600,7 @@ async def setup_mfa(
     qr_code_base64 = base64.b64encode(buffer.getvalue()).decode()
     
     # Generate backup codes
-    backup_codes = [pyotp.random_base32()[:8] for _ in range(10)]
+    backup_codes = generate_backup_codes()
     
     # Store secret temporarily (don't enable until verified)
     current_user.mfa_secret = secret
@@ -765,7 +780,7 @@ async def regenerate_backup_codes(
         )
     
     # Generate new backup codes
-    backup_codes = [pyotp.random_base32()[:8] for _ in range(10)]
+    backup_codes = generate_backup_codes()
     current_user.mfa_backup_codes = ",".join(backup_codes)
     db.commit()
     
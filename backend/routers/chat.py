@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 
 from database.config import get_db
 from auth.dependencies import get_current_user
@@ -102,6 +103,8 @@ async def send_chat_message(
 def get_chat_history(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor_updated_at: Optional[datetime] = Query(default=None, description="updated_at of the last session from the previous page"),
+    cursor_id: Optional[UUID] = Query(default=None, description="id of the last session from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -113,7 +116,8 @@ def get_chat_history(
         db=db,
         user_id=current_user.id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=(cursor_updated_at, cursor_id) if cursor_updated_at and cursor_id else None
     )
     
     return [
@@ -150,6 +154,8 @@ def create_chat_session(
 def get_chat_sessions(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor_updated_at: Optional[datetime] = Query(default=None, description="updated_at of the last session from the previous page"),
+    cursor_id: Optional[UUID] = Query(default=None, description="id of the last session from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -158,7 +164,8 @@ def get_chat_sessions(
         db=db,
         user_id=current_user.id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=(cursor_updated_at, cursor_id) if cursor_updated_at and cursor_id else None
     )
     return sessions
 
@@ -183,7 +190,8 @@ def get_chat_session(
         session_id=session_id,
         user_id=current_user.id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        session_verified=True
     )
     
     # Convert dicts to ChatMessageResponse models
@@ -269,6 +277,8 @@ def get_chat_messages(
     session_id: UUID = None,
     limit: int = Query(default=50, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    cursor_created_at: Optional[datetime] = Query(default=None, description="created_at of the last message from the previous page"),
+    cursor_id: Optional[int] = Query(default=None, description="id of the last message from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -282,7 +292,8 @@ def get_chat_messages(
     messages = ChatService.get_user_messages(
         db=db,
         user_id=current_user.id,
-        query=query
+        query=query,
+        cursor=(cursor_created_at, cursor_id) if cursor_created_at and cursor_id is not None else None
     )
     return messages
 
@@ -398,12 +398,10 @@ async def upload_evidence(
         file_key = f"incidents/{incident_id}/evidence/{file_uuid}_{file.filename}"
         
         try:
-            # Read file content
-            contents = await file.read()
-            
-            # Upload to S3 and get SHA-256 hash
+            # Stream the spooled upload to S3 and get SHA-256 hash
+            await file.seek(0)
             file_hash = upload_file_to_s3(
-                file_content=contents,
+                file_content=file.file,
                 file_key=file_key,
                 content_type=file.content_type
             )
@@ -416,7 +414,7 @@ async def upload_evidence(
                 file_key=file_key,
                 file_hash=file_hash,
                 file_type=file.content_type,
-                file_size=len(contents)
+                file_size=file.size
             )
             
             db.add(evidence)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from database.config import get_db
 from models.lawyers import Lawyer, VerificationStatusEnum
@@ -120,6 +120,7 @@ def get_lawyers_by_district_map(
 @router.post("/register", response_model=LawyerResponse)
 async def register_lawyer(
     lawyer_data: LawyerRegister,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     from models.lawyers import Lawyer, VerificationStatusEnum
@@ -150,7 +151,7 @@ async def register_lawyer(
     
     # Send verification email
     verification_token = generate_verification_token(lawyer.email)
-    send_verification_email(lawyer.email, verification_token, lawyer.name)
+    background_tasks.add_task(send_verification_email, lawyer.email, verification_token, lawyer.name)
     
     return lawyer
 
@@ -381,6 +382,7 @@ async def verify_lawyer_email(
 async def change_lawyer_password(
     password_data: PasswordChange,
     request: Request,
+    background_tasks: BackgroundTasks,
     current_lawyer: Lawyer = Depends(get_current_lawyer),
     db: Session = Depends(get_db)
 ):
@@ -421,7 +423,7 @@ async def change_lawyer_password(
     # Send notification email
     ip_address = request.client.host
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    send_password_changed_email(current_lawyer.email, current_lawyer.name, ip_address, timestamp)
+    background_tasks.add_task(send_password_changed_email, current_lawyer.email, current_lawyer.name, ip_address, timestamp)
     
     return MessageResponse(message="Password changed successfully")
 
@@ -429,6 +431,7 @@ async def change_lawyer_password(
 @router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_lawyer_password(
     reset_data: PasswordResetRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Request password reset for lawyer"""
@@ -438,7 +441,7 @@ async def forgot_lawyer_password(
     # Always return success to prevent email enumeration
     if lawyer and lawyer.is_active:
         reset_token = generate_password_reset_token(lawyer.email)
-        send_password_reset_email(lawyer.email, reset_token, lawyer.name)
+        background_tasks.add_task(send_password_reset_email, lawyer.email, reset_token, lawyer.name)
     
     return MessageResponse(
         message="If the email exists, a password reset link has been sent"
@@ -448,6 +451,7 @@ async def forgot_lawyer_password(
 @router.post("/reset-password", response_model=MessageResponse)
 async def reset_lawyer_password(
     reset_data: PasswordReset,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Reset lawyer password with token"""
@@ -490,7 +494,7 @@ async def reset_lawyer_password(
     
     # Send confirmation email
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    send_password_changed_email(lawyer.email, lawyer.name, "Password Reset", timestamp)
+    background_tasks.add_task(send_password_changed_email, lawyer.email, lawyer.name, "Password Reset", timestamp)
     
     return MessageResponse(message="Password reset successfully")
 
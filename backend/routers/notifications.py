@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from typing import List, Optional, Union
+from datetime import datetime
 import logging
-import json
+import orjson
 
 from database.config import get_db
 from models.notification import RecipientTypeEnum, NotificationTypeEnum
@@ -82,6 +83,8 @@ def get_my_notifications(
     type: Optional[NotificationTypeEnum] = Query(None, description="Filter by notification type"),
     include_read: bool = Query(default=True, description="Include read notifications"),
     priority_min: Optional[int] = Query(None, ge=1, le=3, description="Minimum priority level"),
+    cursor_created_at: Optional[datetime] = Query(default=None, description="created_at of the last notification from the previous page"),
+    cursor_id: Optional[int] = Query(default=None, description="id of the last notification from the previous page"),
     db: Session = Depends(get_db),
     current_user = Depends(get_optional_current_user),
     current_lawyer = Depends(get_current_lawyer),
@@ -97,8 +100,10 @@ def get_my_notifications(
             page=page,
             page_size=page_size,
             notification_type=type,
-            include_read=include_read
+            include_read=include_read,
+            cursor=(cursor_created_at, cursor_id) if cursor_created_at and cursor_id is not None else None
         )
+        next_cursor = result['next_cursor']
         
         # Filter by priority if specified
         if priority_min:
@@ -119,7 +124,9 @@ def get_my_notifications(
             page=result['page'],
             pages=result['pages'],
             page_size=result['page_size'],
-            unread_count=unread_count
+            unread_count=unread_count,
+            next_cursor_created_at=next_cursor[0] if next_cursor else None,
+            next_cursor_id=next_cursor[1] if next_cursor else None
         )
         
     except Exception as e:
@@ -475,11 +482,11 @@ async def websocket_endpoint(
                 
                 # Parse incoming message (for potential future features like marking as read)
                 try:
-                    message = json.loads(data)
+                    message = orjson.loads(data)
                     
                     # Handle ping/pong for connection health
                     if message.get("type") == "ping":
-                        await websocket.send_text(json.dumps({"type": "pong"}))
+                        await manager.send_personal_message({"type": "pong"}, user_type, int(user_id))
                     
                     # Handle mark as read requests
                     elif message.get("type") == "mark_as_read":
@@ -495,13 +502,13 @@ async def websocket_endpoint(
                             service = create_notification_service(recipient_type, db)
                             success = service.mark_as_read(int(notification_id), int(user_id))
                             
-                            await websocket.send_text(json.dumps({
+                            await manager.send_personal_message({
                                 "type": "mark_as_read_response",
                                 "success": success,
                                 "notification_id": notification_id
-                            }))
+                            }, user_type, int(user_id))
                     
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Invalid JSON, ignore
                     pass
                     
@@ -54,6 +54,20 @@ class AdminLogin(BaseModel):
     password: str = Field(..., min_length=8)
 
 
+class AdminLoginMFA(AdminLogin):
+    """Schema for single-step admin login with the MFA code included"""
+    code: str = Field(..., min_length=6, max_length=8, description="6-digit TOTP code or 8-digit backup code")
+    
+    @validator('code')
+    def validate_code(cls, v):
+        # Allow either 6-digit TOTP or 8-character backup code
+        if len(v) == 6 and not v.isdigit():
+            raise ValueError('TOTP code must be 6 digits')
+        elif len(v) == 8 and not v.isalnum():
+            raise ValueError('Backup code must be 8 alphanumeric characters')
+        return v
+
+
 class AdminResponse(AdminBase):
     """Admin response (safe to send to client)"""
     id: int
@@ -193,6 +193,13 @@ class MessageResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class PasswordChangeResponse(MessageResponse):
+    """Password change response with a fresh access token"""
+    new_access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str
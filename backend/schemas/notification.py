@@ -86,11 +86,13 @@ class NotificationResponse(BaseModel):
 class NotificationListResponse(BaseModel):
     """Response schema for paginated notification lists"""
     notifications: List[NotificationResponse]
-    total: int = Field(..., description="Total number of notifications")
+    total: Optional[int] = Field(..., description="Total number of notifications (None when paging by cursor)")
     page: int = Field(..., description="Current page number")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(..., description="Total number of pages (None when paging by cursor)")
     page_size: int = Field(..., description="Number of notifications per page")
     unread_count: int = Field(..., description="Number of unread notifications")
+    next_cursor_created_at: Optional[datetime] = Field(None, description="created_at cursor for the next page")
+    next_cursor_id: Optional[int] = Field(None, description="id cursor for the next page")
 
     class Config:
         json_encoders = {
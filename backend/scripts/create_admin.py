@@ -7,10 +7,17 @@ Run this after applying the 002_auth_system migration.
 
 Usage:
     python create_admin.py
+    python create_admin.py --email admin@example.com --full-name "Site Admin" \
+        --role superadmin --yes
+
+In non-interactive runs (CI, containers) the password is read from the
+environment variable named by --password-env (default: SENTILEX_ADMIN_PASSWORD).
+Prompts are only shown when stdin is a TTY.
 """
 
 import sys
 import os
+import argparse
 from pathlib import Path
 from getpass import getpass
 
@@ -21,15 +28,42 @@ sys.path.insert(0, str(backend_dir))
 from sqlalchemy.orm import Session
 from database.config import get_db, check_db_connection
 from models.admin import Admin, AdminRole
-from utils.auth import hash_password
+from utils.auth import hash_password, generate_backup_codes
 from datetime import datetime
 import pyotp
 import qrcode
 from io import BytesIO
 
 
-def create_admin_account():
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Create an admin account for SentiLex AI Advocate")
+    parser.add_argument("--email", help="Admin email address")
+    parser.add_argument("--full-name", help="Admin full name")
+    parser.add_argument("--role", choices=[r.value for r in AdminRole], help="Admin role (default: admin)")
+    parser.add_argument(
+        "--password-env",
+        default="SENTILEX_ADMIN_PASSWORD",
+        help="Environment variable holding the admin password (default: SENTILEX_ADMIN_PASSWORD)"
+    )
+    parser.add_argument("--yes", "-y", action="store_true", help="Skip the confirmation prompt")
+    return parser.parse_args(argv)
+
+
+def _require(value, prompt, interactive, reader=input):
+    """Return a provided value, prompting for it only when attached to a TTY"""
+    if value:
+        return value
+    if not interactive:
+        print(f"❌ {prompt.rstrip(': ')} is required in non-interactive mode!")
+        sys.exit(1)
+    return reader(prompt)
+
+
+def create_admin_account(argv=None):
     """Create the initial admin account"""
+    args = parse_args(argv)
+    interactive = sys.stdin.isatty()
     
     print("=" * 60)
     print("   SentiLex AI Advocate - Create Initial Admin Account")
@@ -43,35 +77,45 @@ def create_admin_account():
         sys.exit(1)
     
     # Get admin details
-    print("Enter admin account details:")
-    print()
+    if interactive and not (args.full_name and args.email):
+        print("Enter admin account details:")
+        print()
     
-    full_name = input("Full Name: ").strip()
+    full_name = _require(args.full_name, "Full Name: ", interactive).strip()
     if not full_name:
         print("❌ Full name is required!")
         sys.exit(1)
     
-    email = input("Email: ").strip().lower()
+    email = _require(args.email, "Email: ", interactive).strip().lower()
     if not email or '@' not in email:
         print("❌ Valid email is required!")
         sys.exit(1)
     
-    password = getpass("Password (min 12 chars): ")
+    password = os.getenv(args.password_env)
+    if not password:
+        if not interactive:
+            print(f"❌ Set {args.password_env} to provide the admin password in non-interactive mode!")
+            sys.exit(1)
+        password = getpass("Password (min 12 chars): ")
+        password_confirm = getpass("Confirm Password: ")
+        if password != password_confirm:
+            print("❌ Passwords do not match!")
+            sys.exit(1)
     if len(password) < 12:
         print("❌ Password must be at least 12 characters!")
         sys.exit(1)
     
-    password_confirm = getpass("Confirm Password: ")
-    if password != password_confirm:
-        print("❌ Passwords do not match!")
-        sys.exit(1)
-    
     # Ask for role
-    print()
-    print("Select role:")
-    print("  1. Admin (standard access)")
-    print("  2. Superadmin (full system access)")
-    role_choice = input("Choice [1]: ").strip() or "1"
+    if args.role:
+        role_choice = "2" if args.role == AdminRole.SUPERADMIN.value else "1"
+    elif interactive:
+        print()
+        print("Select role:")
+        print("  1. Admin (standard access)")
+        print("  2. Superadmin (full system access)")
+        role_choice = input("Choice [1]: ").strip() or "1"
+    else:
+        role_choice = "1"
     
     if role_choice == "2":
         role = AdminRole.SUPERADMIN  # Uses the enum, which has lowercase value
@@ -80,19 +124,25 @@ def create_admin_account():
         role = AdminRole.ADMIN  # Uses the enum, which has lowercase value
         print("ℹ️  Creating ADMIN account")
     
-    print()
-    confirm = input("Create this admin account? (yes/no): ").strip().lower()
-    if confirm not in ['yes', 'y']:
-        print("❌ Cancelled")
-        sys.exit(0)
+    if interactive and not args.yes:
+        print()
+        confirm = input("Create this admin account? (yes/no): ").strip().lower()
+        if confirm not in ['yes', 'y']:
+            print("❌ Cancelled")
+            sys.exit(0)
     
     # Create admin account
     try:
         db = next(get_db())
         
         # Check if admin already exists
-        existing = db.query(Admin).filter(Admin.email == email).first()
-        if existing:
+        # Only the id is selected; the full Admin row is never hydrated
+        existing = db.query(Admin.id).filter(Admin.email == email).first()
+        if existing is not None:
+            if not interactive:
+                # Re-running a scripted bootstrap is a no-op
+                print(f"ℹ️  Admin with email {email} already exists, nothing to do")
+                sys.exit(0)
             print(f"❌ Admin with email {email} already exists!")
             sys.exit(1)
         
@@ -106,7 +156,7 @@ def create_admin_account():
         print("=" * 60)
         
         mfa_secret = pyotp.random_base32()
-        backup_codes = [pyotp.random_base32()[:8] for _ in range(10)]
+        backup_codes = generate_backup_codes()
         
         # Generate QR code for easy setup
         totp_uri = pyotp.totp.TOTP(mfa_secret).provisioning_uri(
@@ -130,6 +180,7 @@ def create_admin_account():
         print()
         
         # Create admin
+        now = datetime.utcnow()
         admin = Admin(
             email=email,
             password_hash=password_hash,
@@ -140,22 +191,25 @@ def create_admin_account():
             mfa_enabled=True,  # MFA is mandatory for admins
             mfa_secret=mfa_secret,
             mfa_backup_codes=",".join(backup_codes),
-            mfa_enabled_at=datetime.utcnow(),
-            created_at=datetime.utcnow()
+            mfa_enabled_at=now,
+            created_at=now
         )
         
         db.add(admin)
+        # Flush to get the generated id; everything else printed below is
+        # already in locals, so no refresh SELECT is needed after commit.
+        db.flush()
+        admin_id = admin.id
         db.commit()
-        db.refresh(admin)
         
         print()
         print("=" * 60)
         print("✅ Admin account created successfully!")
         print("=" * 60)
-        print(f"   ID: {admin.id}")
-        print(f"   Name: {admin.full_name}")
-        print(f"   Email: {admin.email}")
-        print(f"   Role: {admin.role.value}")
+        print(f"   ID: {admin_id}")
+        print(f"   Name: {full_name}")
+        print(f"   Email: {email}")
+        print(f"   Role: {role.value}")
         print(f"   MFA Enabled: Yes")
         print()
         print("=" * 60)
@@ -6,7 +6,7 @@ This is useful for testing the notification system in development.
 
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path so we can import from backend
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -37,7 +37,7 @@ def create_test_notifications():
                 message="Welcome! Your account is now active and ready to use.",
                 notification_type=NotificationTypeEnum.SYSTEM_UPDATE,
                 priority=1,
-                created_at=datetime.utcnow(),
+                created_at=datetime.now(timezone.utc),
             ),
             Notification(
                 recipient_id=user.id,
@@ -46,7 +46,7 @@ def create_test_notifications():
                 message="Your incident report has been received and is under review.",
                 notification_type=NotificationTypeEnum.CASE_UPDATE,
                 priority=2,
-                created_at=datetime.utcnow() - timedelta(hours=2),
+                created_at=datetime.now(timezone.utc) - timedelta(hours=2),
             ),
             Notification(
                 recipient_id=user.id,
@@ -55,7 +55,7 @@ def create_test_notifications():
                 message="A legal professional is available to consult with you.",
                 notification_type=NotificationTypeEnum.LEGAL_CONSULTATION,
                 priority=2,
-                created_at=datetime.utcnow() - timedelta(hours=5),
+                created_at=datetime.now(timezone.utc) - timedelta(hours=5),
             ),
             Notification(
                 recipient_id=user.id,
@@ -64,8 +64,8 @@ def create_test_notifications():
                 message="Your evidence document has been successfully processed.",
                 notification_type=NotificationTypeEnum.CASE_UPDATE,
                 priority=1,
-                created_at=datetime.utcnow() - timedelta(days=1),
-                read_at=datetime.utcnow() - timedelta(hours=12),  # This one is read
+                created_at=datetime.now(timezone.utc) - timedelta(days=1),
+                read_at=datetime.now(timezone.utc) - timedelta(hours=12),  # This one is read
             ),
         ]
         
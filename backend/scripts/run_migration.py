@@ -9,6 +9,11 @@ Usage:
     python run_migration.py downgrade  # Rollback one migration
     python run_migration.py current    # Show current revision
     python run_migration.py history    # Show migration history
+    python run_migration.py repl       # Read commands from stdin, one per line
+
+The repl action keeps one process, Alembic config and database engine alive
+across commands, e.g.:
+    printf "upgrade head\\ncurrent\\n" | python run_migration.py repl
 """
 
 import sys
@@ -30,6 +35,93 @@ def get_alembic_config():
     return config
 
 
+def upgrade(config, revision=None):
+    # Apply all pending migrations
+    revision = revision or "head"
+    print(f"📦 Upgrading database to: {revision}")
+    command.upgrade(config, revision)
+    print("✅ Migration completed successfully!")
+
+
+def downgrade(config, revision=None):
+    # Rollback migrations
+    revision = revision or "-1"
+    print(f"⏪ Downgrading database to: {revision}")
+    command.downgrade(config, revision)
+    print("✅ Rollback completed successfully!")
+
+
+def current(config, _=None):
+    # Show current revision
+    print("📍 Current database revision:")
+    command.current(config)
+
+
+def history(config, _=None):
+    # Show migration history
+    print("📜 Migration history:")
+    command.history(config)
+
+
+def stamp(config, revision=None):
+    # Mark database as being at specific revision (without running migrations)
+    revision = revision or "head"
+    print(f"🏷️  Stamping database at revision: {revision}")
+    command.stamp(config, revision)
+    print("✅ Database stamped successfully!")
+
+
+def generate(config, message=None):
+    # Auto-generate a new migration
+    message = message or "auto_generated"
+    print(f"🔨 Generating new migration: {message}")
+    command.revision(config, message=message, autogenerate=True)
+    print("✅ Migration generated successfully!")
+
+
+COMMANDS = {
+    "upgrade": upgrade,
+    "downgrade": downgrade,
+    "current": current,
+    "history": history,
+    "stamp": stamp,
+    "generate": generate,
+}
+
+
+def run_action(config, action, argument=None):
+    """Dispatch one action; returns False if the action is unknown"""
+    handler = COMMANDS.get(action)
+    if handler is None:
+        print(f"❌ Unknown action: {action}")
+        return False
+    handler(config, argument)
+    return True
+
+
+def repl(config):
+    """Run commands read from stdin against one shared config and engine"""
+    from database.config import engine
+    config.attributes["engine"] = engine
+    
+    failed = False
+    while line := sys.stdin.readline():
+        parts = line.split(maxsplit=1)
+        if not parts or parts[0].startswith("#"):
+            continue
+        action = parts[0].lower()
+        if action in ("exit", "quit"):
+            break
+        argument = parts[1].strip() if len(parts) > 1 else None
+        try:
+            if not run_action(config, action, argument):
+                failed = True
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            failed = True
+    return not failed
+
+
 def main():
     if len(sys.argv) < 2:
         print(__doc__)
@@ -38,47 +130,11 @@ def main():
     action = sys.argv[1].lower()
     config = get_alembic_config()
     
+    if action == "repl":
+        sys.exit(0 if repl(config) else 1)
+    
     try:
-        if action == "upgrade":
-            # Apply all pending migrations
-            revision = sys.argv[2] if len(sys.argv) > 2 else "head"
-            print(f"📦 Upgrading database to: {revision}")
-            command.upgrade(config, revision)
-            print("✅ Migration completed successfully!")
-            
-        elif action == "downgrade":
-            # Rollback migrations
-            revision = sys.argv[2] if len(sys.argv) > 2 else "-1"
-            print(f"⏪ Downgrading database to: {revision}")
-            command.downgrade(config, revision)
-            print("✅ Rollback completed successfully!")
-            
-        elif action == "current":
-            # Show current revision
-            print("📍 Current database revision:")
-            command.current(config)
-            
-        elif action == "history":
-            # Show migration history
-            print("📜 Migration history:")
-            command.history(config)
-            
-        elif action == "stamp":
-            # Mark database as being at specific revision (without running migrations)
-            revision = sys.argv[2] if len(sys.argv) > 2 else "head"
-            print(f"🏷️  Stamping database at revision: {revision}")
-            command.stamp(config, revision)
-            print("✅ Database stamped successfully!")
-            
-        elif action == "generate":
-            # Auto-generate a new migration
-            message = sys.argv[2] if len(sys.argv) > 2 else "auto_generated"
-            print(f"🔨 Generating new migration: {message}")
-            command.revision(config, message=message, autogenerate=True)
-            print("✅ Migration generated successfully!")
-            
-        else:
-            print(f"❌ Unknown action: {action}")
+        if not run_action(config, action, sys.argv[2] if len(sys.argv) > 2 else None):
             print(__doc__)
             sys.exit(1)
             
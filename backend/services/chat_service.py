@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select, update, delete, case, and_, tuple_
 from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from models.session_chat import SessionChatMessage, ChatSession
 from schemas.chat import (
@@ -55,8 +55,6 @@ class ChatService:
         """Save both user message and assistant response in one transaction.
         Returns dicts instead of model objects to avoid session expiration issues."""
         
-        from datetime import datetime, timezone
-        
         # Store creation timestamp with timezone
         now = datetime.now(timezone.utc)
         
@@ -70,11 +68,8 @@ class ChatService:
             created_at=now
         )
         
-        db.add(user_msg)
-        db.flush()  # Flush to get the ID before adding second message
-        
         # Create assistant message with slightly different timestamp to avoid PK conflict
-        assistant_now = datetime.now(timezone.utc)
+        assistant_now = now + timedelta(microseconds=1)
         assistant_msg = SessionChatMessage(
             user_id=user_id,
             session_id=session_id,
@@ -84,50 +79,58 @@ class ChatService:
             created_at=assistant_now
         )
         
-        db.add(assistant_msg)
+        # Both rows go out in a single multi-row INSERT ... RETURNING
+        db.add_all([user_msg, assistant_msg])
         
-        # Update session metadata
-        session = db.query(ChatSession).filter(
-            ChatSession.id == session_id
-        ).first()
+        # Auto-generate title from first user message if still "New Chat"
+        # (first 50 chars of the user message)
+        new_title = user_message[:50].strip()
+        if len(user_message) > 50:
+            new_title += "..."
         
-        if session:
-            session.message_count += 2  # Both user and assistant messages
-            session.last_message = assistant_message[:200]
-            session.updated_at = func.now()
-            
-            # Auto-generate title from first user message if still "New Chat"
-            if session.title == "New Chat" and session.message_count == 2:
-                # Use first 50 chars of user message as title
-                session.title = user_message[:50].strip()
-                if len(user_message) > 50:
-                    session.title += "..."
+        # Update session metadata in place, without loading the row first
+        db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id)
+            .values(
+                message_count=ChatSession.message_count + 2,  # Both user and assistant messages
+                last_message=assistant_message[:200],
+                updated_at=now,
+                title=case(
+                    (and_(ChatSession.title == "New Chat", ChatSession.message_count == 0), new_title),
+                    else_=ChatSession.title
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
         
-        db.commit()
+        # Flush the INSERT; the generated IDs come back via RETURNING, so no
+        # post-commit refresh is needed
+        db.flush()
+        user_msg_id = user_msg.id
+        assistant_msg_id = assistant_msg.id
         
-        # Refresh to get the generated IDs
-        db.refresh(user_msg)
-        db.refresh(assistant_msg)
+        db.commit()
         
         # Return dicts
         user_msg_dict = {
-            'id': user_msg.id,
+            'id': user_msg_id,
             'session_id': session_id,
             'user_id': user_id,
             'role': "user",
             'content': user_message,
             'metadata': user_metadata or {},
-            'created_at': user_msg.created_at
+            'created_at': now
         }
         
         assistant_msg_dict = {
-            'id': assistant_msg.id,
+            'id': assistant_msg_id,
             'session_id': session_id,
             'user_id': user_id,
             'role': "assistant",
             'content': assistant_message,
             'metadata': assistant_metadata or {},
-            'created_at': assistant_msg.created_at
+            'created_at': assistant_now
         }
         
         return user_msg_dict, assistant_msg_dict
@@ -158,14 +161,51 @@ class ChatService:
         db: Session, 
         user_id: int, 
         limit: int = 50, 
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, UUID]] = None
     ) -> List[ChatSession]:
-        """Get all chat sessions for a user"""
-        return db.query(ChatSession).filter(
+        """Get all chat sessions for a user.
+        Pass the (updated_at, id) of the last session seen as cursor to fetch the
+        next page with an index range scan instead of OFFSET."""
+        query = db.query(ChatSession).filter(
+            ChatSession.user_id == user_id
+        )
+        
+        if cursor:
+            query = query.filter(tuple_(ChatSession.updated_at, ChatSession.id) < cursor)
+        else:
+            query = query.offset(offset)
+        
+        return query.order_by(
+            desc(ChatSession.updated_at),
+            desc(ChatSession.id)
+        ).limit(limit).all()
+    
+    @staticmethod
+    def get_user_sessions_with_total(
+        db: Session,
+        user_id: int,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[ChatSession], int]:
+        """Get a page of chat sessions together with the user's total session count.
+        The total comes from COUNT(*) OVER () in the same query, so pagination UIs
+        don't need a separate get_session_count round trip."""
+        rows = db.query(
+            ChatSession,
+            func.count().over().label('total')
+        ).filter(
             ChatSession.user_id == user_id
         ).order_by(
-            desc(ChatSession.updated_at)
+            desc(ChatSession.updated_at),
+            desc(ChatSession.id)
         ).limit(limit).offset(offset).all()
+        
+        if not rows:
+            # An offset past the end returns no rows to carry the total
+            return [], ChatService.get_session_count(db, user_id) if offset else 0
+        
+        return [row.ChatSession for row in rows], rows[0].total
     
     @staticmethod
     def update_session(
@@ -189,18 +229,15 @@ class ChatService:
     @staticmethod
     def delete_session(db: Session, session_id: UUID, user_id: int) -> bool:
         """Delete a chat session and all its messages"""
-        session = ChatService.get_session(db, session_id, user_id)
-        if not session:
-            return False
-        
-        # Delete all messages in the session
-        db.query(SessionChatMessage).filter(
-            SessionChatMessage.session_id == session_id
-        ).delete()
-        
-        db.delete(session)
+        # Messages are removed by the ON DELETE CASCADE on session_id
+        result = db.execute(
+            delete(ChatSession).where(
+                ChatSession.id == session_id,
+                ChatSession.user_id == user_id
+            )
+        )
         db.commit()
-        return True
+        return result.rowcount > 0
     
     @staticmethod
     def create_message(
@@ -209,12 +246,14 @@ class ChatService:
         message_data: ChatMessageCreate
     ) -> SessionChatMessage:
         """Create a new chat message"""
+        now = datetime.now(timezone.utc)
         message = SessionChatMessage(
             user_id=user_id,
             session_id=message_data.session_id,
             role=message_data.role,
             content=message_data.content,
-            metadata=message_data.metadata or {}
+            metadata=message_data.metadata or {},
+            created_at=now
         )
         db.add(message)
         
@@ -226,7 +265,7 @@ class ChatService:
         if session:
             session.message_count += 1
             session.last_message = message_data.content[:200]  # Store preview
-            session.updated_at = func.now()
+            session.updated_at = now
         
         db.commit()
         db.refresh(message)
@@ -238,37 +277,48 @@ class ChatService:
         session_id: UUID,
         user_id: int,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        session_verified: bool = False
     ) -> List[dict]:
-        """Get messages for a specific session, returns dicts to avoid metadata attribute conflicts"""
-        messages = db.query(SessionChatMessage).filter(
-            SessionChatMessage.session_id == session_id,
-            SessionChatMessage.user_id == user_id
-        ).order_by(
-            SessionChatMessage.created_at.asc()
-        ).limit(limit).offset(offset).all()
+        """Get messages for a specific session, returns dicts to avoid metadata attribute conflicts.
+        Ownership is checked once on the session; pass session_verified=True if the
+        caller has already loaded the session for this user."""
+        if not session_verified and not ChatService.get_session(db, session_id, user_id):
+            return []
+        
+        # Project only the needed columns so rows come back as mappings
+        # without building ORM objects
+        rows = db.execute(
+            select(
+                SessionChatMessage.id,
+                SessionChatMessage.session_id,
+                SessionChatMessage.user_id,
+                SessionChatMessage.role,
+                SessionChatMessage.content,
+                SessionChatMessage.message_metadata.label('metadata'),
+                SessionChatMessage.created_at
+            ).where(
+                # Served by the (session_id, created_at) index without a sort
+                SessionChatMessage.session_id == session_id
+            ).order_by(
+                SessionChatMessage.created_at.asc()
+            ).limit(limit).offset(offset)
+        ).mappings().all()
         
-        # Convert to dicts to avoid SQLAlchemy metadata conflicts
         return [
-            {
-                'id': msg.id,
-                'session_id': msg.session_id,
-                'user_id': msg.user_id,
-                'role': msg.role,
-                'content': msg.content,
-                'metadata': msg.message_metadata or {},  # Use message_metadata attribute
-                'created_at': msg.created_at
-            }
-            for msg in messages
+            {**row, 'metadata': row['metadata'] or {}}
+            for row in rows
         ]
     
     @staticmethod
     def get_user_messages(
         db: Session,
         user_id: int,
-        query: ChatHistoryQuery
+        query: ChatHistoryQuery,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> List[SessionChatMessage]:
-        """Get chat messages for a user with filters"""
+        """Get chat messages for a user with filters.
+        Pass the (created_at, id) of the last message seen as cursor for keyset pagination."""
         filters = [SessionChatMessage.user_id == user_id]
         
         if query.session_id:
@@ -280,11 +330,20 @@ class ChatService:
         if query.end_date:
             filters.append(SessionChatMessage.created_at <= query.end_date)
         
-        return db.query(SessionChatMessage).filter(
+        if cursor:
+            filters.append(tuple_(SessionChatMessage.created_at, SessionChatMessage.id) < cursor)
+        
+        messages = db.query(SessionChatMessage).filter(
             *filters
         ).order_by(
-            desc(SessionChatMessage.created_at)
-        ).limit(query.limit).offset(query.offset).all()
+            desc(SessionChatMessage.created_at),
+            desc(SessionChatMessage.id)
+        ).limit(query.limit)
+        
+        if not cursor:
+            messages = messages.offset(query.offset)
+        
+        return messages.all()
     
     @staticmethod
     def delete_message(db: Session, message_id: int, user_id: int) -> bool:
@@ -313,7 +372,8 @@ class ChatService:
     
     @staticmethod
     def get_session_count(db: Session, user_id: int) -> int:
-        """Get total number of sessions for a user"""
+        """Get total number of sessions for a user.
+        Deprecated for paginated listings: use get_user_sessions_with_total instead."""
         return db.query(func.count(ChatSession.id)).filter(
             ChatSession.user_id == user_id
         ).scalar()
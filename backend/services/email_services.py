@@ -1,7 +1,11 @@
 import os
+import re
+import html
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from string import Template
+from functools import lru_cache
+from email import policy
+from email.message import EmailMessage
 from typing import Optional
 import logging
 
@@ -12,6 +16,7 @@ EMAIL_ENABLED = os.getenv("EMAIL_ENABLED", "false").lower() == "true"
 EMAIL_PROVIDER = os.getenv("EMAIL_PROVIDER", "smtp")  # smtp, sendgrid, ses
 EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@sentilex.lk")
 EMAIL_FROM_NAME = os.getenv("EMAIL_FROM_NAME", "Sentilex AI Advocate")
+_EMAIL_FROM_HEADER = f"{EMAIL_FROM_NAME} <{EMAIL_FROM}>"
 
 # SMTP Configuration
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -24,12 +29,42 @@ SMTP_TLS = os.getenv("SMTP_TLS", "true").lower() == "true"
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
 
+# SMTP policy emits CRLF line endings up front, so the flattened bytes go out
+# without a second end-of-line rewrite; lines are only folded at the RFC 5322
+# hard limit (998) so long URLs don't trigger folding work on every send
+_MESSAGE_POLICY = policy.SMTP.clone(max_line_length=998)
+
+
+def _build_message(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> EmailMessage:
+    """Build the MIME message for the SMTP provider"""
+    msg = EmailMessage(policy=_MESSAGE_POLICY)
+    msg['Subject'] = subject
+    msg['From'] = _EMAIL_FROM_HEADER
+    msg['To'] = to_email
+    
+    # Quoted-printable keeps the mostly-ASCII HTML readable and avoids the
+    # ~33% size overhead of base64
+    if text_content:
+        msg.set_content(text_content)
+        msg.add_alternative(html_content, subtype='html', cte='quoted-printable')
+    else:
+        msg.set_content(html_content, subtype='html', cte='quoted-printable')
+    return msg
+
+
 class EmailService:
     """Email service for sending transactional emails"""
     
-    def __init__(self):
-        self.enabled = EMAIL_ENABLED
-        self.provider = EMAIL_PROVIDER
+    __slots__ = ()
+    
+    # Configuration is fixed at import, so it lives on the class
+    enabled = EMAIL_ENABLED
+    provider = EMAIL_PROVIDER
     
     def send_email(
         self, 
@@ -71,19 +106,7 @@ class EmailService:
             logger.error("SMTP credentials not configured")
             return False
         
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{EMAIL_FROM_NAME} <{EMAIL_FROM}>"
-        msg['To'] = to_email
-        
-        # Add text and HTML parts
-        if text_content:
-            part1 = MIMEText(text_content, 'plain')
-            msg.attach(part1)
-        
-        part2 = MIMEText(html_content, 'html')
-        msg.attach(part2)
+        msg = _build_message(to_email, subject, html_content, text_content)
         
         # Send email
         with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
@@ -108,9 +131,18 @@ class EmailService:
         return False
 
 # Email Templates
-def get_verification_email_html(verification_url: str, user_name: str) -> str:
-    """Generate HTML for email verification"""
-    return f"""
+# The shared wrapper (head, gradient header, footer) is built once at import.
+# Each kind only contributes its header text and content block.
+# Same mapping as html.escape(quote=True), applied in a single str.translate pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+_BASE_PREFIX = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -119,35 +151,73 @@ def get_verification_email_html(verification_url: str, user_name: str) -> str:
     </head>
     <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
         <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="color: white; margin: 0;">Sentilex AI Advocate</h1>
-            <p style="color: white; margin: 10px 0 0 0;">Legal Justice Platform</p>
-        </div>
+"""
+
+_CONTENT_OPEN = """        </div>
         
         <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #667eea; margin-top: 0;">Verify Your Email Address</h2>
-            
-            <p>Dear {user_name},</p>
-            
-            <p>Thank you for registering with Sentilex AI Advocate. To complete your registration and start using our platform, please verify your email address.</p>
+"""
+
+_FOOTER = """            
+            <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
             
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{verification_url}" 
-                   style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+            <p style="color: #999; font-size: 12px; text-align: center;">
+                Sentilex AI Advocate - Bridging Trauma to Justice<br>
+                {note}
+            </p>
+        </div>
+    </body>
+    </html>
+    """
+
+_BASE_SUFFIX = _FOOTER.format(note="This is an automated email, please do not reply.")
+_BASE_SUFFIX_SUPPORT = _FOOTER.format(note="Need help? Email us at support@sentilex.lk")
+
+_BUTTON_STYLE = """background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                           color: white; 
                           padding: 15px 40px; 
                           text-decoration: none; 
                           border-radius: 5px; 
                           display: inline-block;
-                          font-weight: bold;">
-                    Verify Email Address
+                          font-weight: bold;"""
+
+
+def _header(title: str, subtitle: Optional[str] = None) -> str:
+    html_header = f"""            <h1 style="color: white; margin: 0;">{title}</h1>\n"""
+    if subtitle:
+        html_header += f"""            <p style="color: white; margin: 10px 0 0 0;">{subtitle}</p>\n"""
+    return html_header + _CONTENT_OPEN
+
+
+def _button(url_var: str, label: str) -> str:
+    return f"""            <div style="text-align: center; margin: 30px 0;">
+                <a href="{url_var}" 
+                   style="{_BUTTON_STYLE}">
+                    {label}
                 </a>
             </div>
-            
+"""
+
+
+def _link_fallback(url_var: str) -> str:
+    return f"""            
             <p style="color: #666; font-size: 14px;">
                 If the button above doesn't work, copy and paste this link into your browser:<br>
-                <a href="{verification_url}" style="color: #667eea; word-break: break-all;">{verification_url}</a>
+                <a href="{url_var}" style="color: #667eea; word-break: break-all;">{url_var}</a>
             </p>
+"""
+
+
+# kind -> (content block, footer)
+_CONTENT_BLOCKS = {
+    "verify": (Template(
+        _header("Sentilex AI Advocate", "Legal Justice Platform") + """            <h2 style="color: #667eea; margin-top: 0;">Verify Your Email Address</h2>
+            
+            <p>Dear $user_name,</p>
             
+            <p>Thank you for registering with Sentilex AI Advocate. To complete your registration and start using our platform, please verify your email address.</p>
+            
+""" + _button("$verification_url", "Verify Email Address") + _link_fallback("$verification_url") + """            
             <p style="color: #666; font-size: 14px; margin-top: 30px;">
                 This verification link will expire in 24 hours for security reasons.
             </p>
@@ -155,105 +225,34 @@ def get_verification_email_html(verification_url: str, user_name: str) -> str:
             <p style="color: #666; font-size: 14px;">
                 If you didn't create this account, please ignore this email.
             </p>
+"""), _BASE_SUFFIX),
+    "password_reset": (Template(
+        _header("Sentilex AI Advocate", "Password Reset Request") + """            <h2 style="color: #667eea; margin-top: 0;">Reset Your Password</h2>
             
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
-            
-            <p style="color: #999; font-size: 12px; text-align: center;">
-                Sentilex AI Advocate - Bridging Trauma to Justice<br>
-                This is an automated email, please do not reply.
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-
-
-def get_password_reset_email_html(reset_url: str, user_name: str) -> str:
-    """Generate HTML for password reset"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="color: white; margin: 0;">Sentilex AI Advocate</h1>
-            <p style="color: white; margin: 10px 0 0 0;">Password Reset Request</p>
-        </div>
-        
-        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #667eea; margin-top: 0;">Reset Your Password</h2>
-            
-            <p>Dear {user_name},</p>
+            <p>Dear $user_name,</p>
             
             <p>We received a request to reset your password. Click the button below to create a new password:</p>
             
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{reset_url}" 
-                   style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                          color: white; 
-                          padding: 15px 40px; 
-                          text-decoration: none; 
-                          border-radius: 5px; 
-                          display: inline-block;
-                          font-weight: bold;">
-                    Reset Password
-                </a>
-            </div>
-            
-            <p style="color: #666; font-size: 14px;">
-                If the button above doesn't work, copy and paste this link into your browser:<br>
-                <a href="{reset_url}" style="color: #667eea; word-break: break-all;">{reset_url}</a>
-            </p>
-            
+""" + _button("$reset_url", "Reset Password") + _link_fallback("$reset_url") + """            
             <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 5px;">
                 <strong style="color: #856404;">⚠️ Security Notice:</strong>
                 <p style="color: #856404; margin: 5px 0 0 0; font-size: 14px;">
                     This password reset link will expire in 1 hour. If you didn't request this reset, please ignore this email and your password will remain unchanged.
                 </p>
             </div>
+"""), _BASE_SUFFIX),
+    "password_changed": (Template(
+        _header("Sentilex AI Advocate", "Security Alert") + """            <h2 style="color: #667eea; margin-top: 0;">Password Changed Successfully</h2>
             
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
-            
-            <p style="color: #999; font-size: 12px; text-align: center;">
-                Sentilex AI Advocate - Bridging Trauma to Justice<br>
-                This is an automated email, please do not reply.
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-
-
-def get_password_changed_email_html(user_name: str, ip_address: str, timestamp: str) -> str:
-    """Generate HTML for password change notification"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="color: white; margin: 0;">Sentilex AI Advocate</h1>
-            <p style="color: white; margin: 10px 0 0 0;">Security Alert</p>
-        </div>
-        
-        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #667eea; margin-top: 0;">Password Changed Successfully</h2>
-            
-            <p>Dear {user_name},</p>
+            <p>Dear $user_name,</p>
             
             <p>This is to confirm that your password was successfully changed.</p>
             
             <div style="background: #e8f4f8; border-left: 4px solid #17a2b8; padding: 15px; margin: 20px 0; border-radius: 5px;">
                 <p style="margin: 0; font-size: 14px;"><strong>Change Details:</strong></p>
                 <p style="margin: 5px 0 0 0; font-size: 14px;">
-                    <strong>Time:</strong> {timestamp}<br>
-                    <strong>IP Address:</strong> {ip_address}
+                    <strong>Time:</strong> $timestamp<br>
+                    <strong>IP Address:</strong> $ip_address
                 </p>
             </div>
             
@@ -263,37 +262,11 @@ def get_password_changed_email_html(user_name: str, ip_address: str, timestamp:
                     If you didn't authorize this password change, please contact our support team immediately at support@sentilex.lk
                 </p>
             </div>
+"""), _BASE_SUFFIX),
+    "welcome": (Template(
+        _header("Welcome to Sentilex!") + """            <h2 style="color: #667eea; margin-top: 0;">Your Account is Ready</h2>
             
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
-            
-            <p style="color: #999; font-size: 12px; text-align: center;">
-                Sentilex AI Advocate - Bridging Trauma to Justice<br>
-                This is an automated email, please do not reply.
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-
-
-def get_welcome_email_html(user_name: str) -> str:
-    """Generate HTML for welcome email after verification"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="color: white; margin: 0;">Welcome to Sentilex!</h1>
-        </div>
-        
-        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #667eea; margin-top: 0;">Your Account is Ready</h2>
-            
-            <p>Dear {user_name},</p>
+            <p>Dear $user_name,</p>
             
             <p>Welcome to Sentilex AI Advocate! Your email has been verified and your account is now active.</p>
             
@@ -307,34 +280,59 @@ def get_welcome_email_html(user_name: str) -> str:
                 <li style="margin-bottom: 10px;"><strong>Secure Evidence:</strong> Store documents with blockchain verification</li>
             </ul>
             
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{FRONTEND_URL}/dashboard" 
-                   style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                          color: white; 
-                          padding: 15px 40px; 
-                          text-decoration: none; 
-                          border-radius: 5px; 
-                          display: inline-block;
-                          font-weight: bold;">
-                    Go to Dashboard
-                </a>
-            </div>
-            
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
-            
-            <p style="color: #999; font-size: 12px; text-align: center;">
-                Sentilex AI Advocate - Bridging Trauma to Justice<br>
-                Need help? Email us at support@sentilex.lk
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+""" + _button("$frontend_url/dashboard", "Go to Dashboard")), _BASE_SUFFIX_SUPPORT),
+}
+
+
+def render_email(kind: str, **values: str) -> str:
+    """Render an email body; every substituted value is HTML-escaped"""
+    content, suffix = _CONTENT_BLOCKS[kind]
+    escaped = {key: value.translate(_HTML_ESCAPE_TABLE) for key, value in values.items()}
+    return _BASE_PREFIX + content.substitute(escaped) + suffix
+
+
+_LINK_RE = re.compile(r'<a\s[^>]*href="([^"]+)"[^>]*>(.*?)</a>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _link_to_text(match: "re.Match[str]") -> str:
+    url, label = match.group(1), " ".join(match.group(2).split())
+    return url if label == url else f"{label}: {url}"
+
+
+@lru_cache(maxsize=1024)
+def _text_from_html(html_content: str) -> str:
+    """Derive the plain-text alternative for an HTML email (cached per rendered body)"""
+    text = _TAG_RE.sub("", _LINK_RE.sub(_link_to_text, html_content))
+    lines = [line.strip() for line in html.unescape(text).splitlines()]
+    # Collapse runs of blank lines left behind by the markup
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def get_verification_email_html(verification_url: str, user_name: str) -> str:
+    """Generate HTML for email verification"""
+    return render_email("verify", verification_url=verification_url, user_name=user_name)
+
+
+def get_password_reset_email_html(reset_url: str, user_name: str) -> str:
+    """Generate HTML for password reset"""
+    return render_email("password_reset", reset_url=reset_url, user_name=user_name)
+
+
+def get_password_changed_email_html(user_name: str, ip_address: str, timestamp: str) -> str:
+    """Generate HTML for password change notification"""
+    return render_email("password_changed", user_name=user_name, ip_address=ip_address, timestamp=timestamp)
+
+
+def get_welcome_email_html(user_name: str) -> str:
+    """Generate HTML for welcome email after verification"""
+    return render_email("welcome", frontend_url=FRONTEND_URL, user_name=user_name)
 
 
 # Helper functions for sending specific emails
 email_service = EmailService()
 
+
 def send_verification_email(email: str, token: str, user_name: str) -> bool:
     """Send email verification email"""
     verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
@@ -343,7 +341,8 @@ def send_verification_email(email: str, token: str, user_name: str) -> bool:
     return email_service.send_email(
         to_email=email,
         subject="Verify Your Sentilex Account",
-        html_content=html_content
+        html_content=html_content,
+        text_content=_text_from_html(html_content)
     )
 
 
@@ -355,7 +354,8 @@ def send_password_reset_email(email: str, token: str, user_name: str) -> bool:
     return email_service.send_email(
         to_email=email,
         subject="Reset Your Sentilex Password",
-        html_content=html_content
+        html_content=html_content,
+        text_content=_text_from_html(html_content)
     )
 
 
@@ -371,7 +371,8 @@ def send_password_changed_email(
     return email_service.send_email(
         to_email=email,
         subject="Your Sentilex Password Was Changed",
-        html_content=html_content
+        html_content=html_content,
+        text_content=_text_from_html(html_content)
     )
 
 
@@ -382,5 +383,6 @@ def send_welcome_email(email: str, user_name: str) -> bool:
     return email_service.send_email(
         to_email=email,
         subject="Welcome to Sentilex AI Advocate! 🎉",
-        html_content=html_content
+        html_content=html_content,
+        text_content=_text_from_html(html_content)
     )
@@ -1,11 +1,23 @@
-from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Union
+from abc import ABC
+from typing import ClassVar, List, Optional, Dict, Any, Tuple, Union
+from sqlalchemy import func, insert, tuple_, update
 from sqlalchemy.orm import Session
-from datetime import datetime
-import json
-import asyncio
+from datetime import datetime, timezone
 
 from models.notification import Notification, RecipientTypeEnum, NotificationTypeEnum
+from services.redis_client import get_redis
+from services.websocket_manager import publish_notifications
+
+UNREAD_COUNT_TTL = 60
+
+# Only adjust counts that are already cached; an absent key is filled from
+# the database on the next read, so a blind INCR can't create a wrong value
+_ADJUST_IF_CACHED = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
 
 
 class NotificationService(ABC):
@@ -20,13 +32,21 @@ class NotificationService(ABC):
     5. **Flexibility**: Can switch implementations without changing client code
     """
     
+    # Recipient type this service handles; a plain class attribute so query
+    # filters read a constant instead of making a method call
+    RECIPIENT_TYPE: ClassVar[RecipientTypeEnum]
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not hasattr(cls, 'RECIPIENT_TYPE'):
+            raise TypeError(f"{cls.__name__} must define RECIPIENT_TYPE")
+    
     def __init__(self, db_session: Session):
         self.db = db_session
     
-    @abstractmethod
     def get_recipient_type(self) -> RecipientTypeEnum:
         """Get the recipient type this service handles"""
-        pass
+        return self.RECIPIENT_TYPE
     
     def send(
         self, 
@@ -57,44 +77,32 @@ class NotificationService(ABC):
         """
         notification = Notification(
             recipient_id=recipient_id,
-            recipient_type=self.get_recipient_type(),
+            recipient_type=self.RECIPIENT_TYPE,
             title=title,
             message=message,
             type=notification_type,
             priority=priority,
             action_url=action_url,
-            metadata_json=json.dumps(metadata) if metadata else None,
+            metadata_json=metadata or None,
             expires_at=expires_at
         )
         
         self.db.add(notification)
+        # eager_defaults brings id and DB-side timestamps back via RETURNING
+        self.db.flush()
+        # Detach so the commit doesn't expire what the INSERT just loaded;
+        # callers and the websocket push only read from it
+        self.db.expunge(notification)
         self.db.commit()
-        self.db.refresh(notification)
+        
+        self._adjust_unread_cache(recipient_id, 1)
         
         # Hook for subclasses to implement additional logic
         self._post_send_hook(notification)
         
-        # Send WebSocket notification asynchronously
+        # Fan the WebSocket notification out to whichever worker holds the socket
         try:
-            # Import here to avoid circular imports
-            from services.websocket_manager import get_notification_manager
-            manager = get_notification_manager()
-            
-            # Schedule the WebSocket notification to be sent
-            import threading
-            def send_websocket():
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(manager.send_notification(notification))
-                    loop.close()
-                except Exception as e:
-                    print(f"WebSocket send error: {e}")
-            
-            # Run in background thread to avoid blocking
-            thread = threading.Thread(target=send_websocket)
-            thread.daemon = True
-            thread.start()
+            publish_notifications([notification])
             
         except Exception as e:
             # Don't let WebSocket errors break the notification creation
@@ -102,6 +110,60 @@ class NotificationService(ABC):
         
         return notification
     
+    def send_many(
+        self,
+        recipient_ids: List[int],
+        message: str,
+        title: Optional[str] = None,
+        notification_type: NotificationTypeEnum = NotificationTypeEnum.SYSTEM,
+        priority: int = 1,
+        action_url: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        expires_at: Optional[datetime] = None
+    ) -> List[Notification]:
+        """
+        Send the same notification to many recipients in one transaction.
+        
+        Rows are written with a single executemany INSERT ... RETURNING instead
+        of one commit per recipient, and the WebSocket pushes go out together.
+        
+        Returns:
+            Created notification instances
+        """
+        if not recipient_ids:
+            return []
+        
+        values = {
+            'recipient_type': self.RECIPIENT_TYPE,
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'priority': priority,
+            'action_url': action_url,
+            'metadata_json': metadata or None,
+            'expires_at': expires_at
+        }
+        notifications = self.db.scalars(
+            insert(Notification).returning(Notification),
+            [{**values, 'recipient_id': recipient_id} for recipient_id in recipient_ids]
+        ).all()
+        for notification in notifications:
+            self.db.expunge(notification)
+        self.db.commit()
+        
+        for notification in notifications:
+            self._adjust_unread_cache(notification.recipient_id, 1)
+            self._post_send_hook(notification)
+        
+        try:
+            publish_notifications(notifications)
+            
+        except Exception as e:
+            # Don't let WebSocket errors break the notification creation
+            print(f"Warning: Failed to send WebSocket notifications: {e}")
+        
+        return notifications
+    
     def mark_as_read(self, notification_id: int, recipient_id: int) -> bool:
         """
         Mark notification as read (with recipient verification).
@@ -113,18 +175,27 @@ class NotificationService(ABC):
         Returns:
             True if marked successfully, False otherwise
         """
-        notification = self.db.query(Notification).filter(
+        owned = (
             Notification.id == notification_id,
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type(),
+            Notification.recipient_type == self.RECIPIENT_TYPE,
             Notification.is_deleted == False
-        ).first()
+        )
         
-        if notification:
-            notification.mark_as_read()
-            self.db.commit()
+        # Conditional UPDATE instead of loading the row; only an unread row matches
+        updated = self.db.query(Notification).filter(
+            *owned, Notification.is_read == False
+        ).update(
+            {Notification.is_read: True, Notification.read_at: datetime.now(timezone.utc)},
+            synchronize_session=False
+        )
+        self.db.commit()
+        
+        if updated:
+            self._adjust_unread_cache(recipient_id, -1)
             return True
-        return False
+        # Already read still counts as success, as long as the row is theirs
+        return self.db.query(self.db.query(Notification).filter(*owned).exists()).scalar()
     
     def get_unread(
         self, 
@@ -134,7 +205,7 @@ class NotificationService(ABC):
         """Get unread notifications for recipient"""
         query = self.db.query(Notification).filter(
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type(),
+            Notification.recipient_type == self.RECIPIENT_TYPE,
             Notification.is_read == False,
             Notification.is_deleted == False
         ).order_by(Notification.created_at.desc())
@@ -150,87 +221,160 @@ class NotificationService(ABC):
         page: int = 1,
         page_size: int = 20,
         notification_type: Optional[NotificationTypeEnum] = None,
-        include_read: bool = True
+        include_read: bool = True,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> Dict[str, Any]:
         """
         Get all notifications for recipient with pagination.
         
+        Pass the (created_at, id) of the last notification seen as cursor for
+        keyset pagination; 'total' and 'pages' are None in that mode.
+        
         Returns:
-            Dict with 'notifications', 'total', 'page', 'pages' keys
+            Dict with 'notifications', 'total', 'page', 'pages', 'next_cursor' keys
         """
-        query = self.db.query(Notification).filter(
+        filters = [
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type(),
+            Notification.recipient_type == self.RECIPIENT_TYPE,
             Notification.is_deleted == False
-        )
+        ]
         
         if notification_type:
-            query = query.filter(Notification.type == notification_type)
+            filters.append(Notification.type == notification_type)
             
         if not include_read:
-            query = query.filter(Notification.is_read == False)
+            filters.append(Notification.is_read == False)
         
-        # Get total count
-        total = query.count()
+        order = (Notification.created_at.desc(), Notification.id.desc())
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        notifications = query.order_by(
-            Notification.created_at.desc()
-        ).offset(offset).limit(page_size).all()
+        if cursor:
+            # Keyset pagination: a range scan on the feed index, whatever the depth
+            notifications = self.db.query(Notification).filter(
+                *filters,
+                tuple_(Notification.created_at, Notification.id) < cursor
+            ).order_by(*order).limit(page_size).all()
+            total = pages = None
+        else:
+            # COUNT(*) OVER() returns the total alongside the page in one round trip
+            query = self.db.query(
+                Notification, func.count().over().label('total')
+            ).filter(*filters)
+            
+            # Apply pagination
+            offset = (page - 1) * page_size
+            rows = query.order_by(*order).offset(offset).limit(page_size).all()
+            
+            notifications = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Past the last page the window has no rows to report the total on
+                total = query.with_entities(func.count(Notification.id)).scalar()
+            else:
+                total = 0
+            
+            pages = (total + page_size - 1) // page_size
         
-        pages = (total + page_size - 1) // page_size
+        next_cursor = None
+        if len(notifications) == page_size:
+            last = notifications[-1]
+            next_cursor = (last.created_at, last.id)
         
         return {
             'notifications': notifications,
             'total': total,
             'page': page,
             'pages': pages,
-            'page_size': page_size
+            'page_size': page_size,
+            'next_cursor': next_cursor
         }
     
     def get_unread_count(self, recipient_id: int) -> int:
-        """Get count of unread notifications"""
-        return self.db.query(Notification).filter(
+        """Get count of unread notifications (cached in Redis when available)"""
+        r = get_redis()
+        key = self._unread_cache_key(recipient_id)
+        if r is not None:
+            try:
+                cached = r.get(key)
+                if cached is not None:
+                    return int(cached)
+            except Exception as e:
+                print(f"Warning: Unread count cache read failed: {e}")
+        
+        count = self.db.query(Notification).filter(
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type(),
+            Notification.recipient_type == self.RECIPIENT_TYPE,
             Notification.is_read == False,
             Notification.is_deleted == False
         ).count()
+        
+        self._set_unread_cache(recipient_id, count)
+        return count
     
     def soft_delete(self, notification_id: int, recipient_id: int) -> bool:
         """Soft delete a notification (with recipient verification)"""
-        notification = self.db.query(Notification).filter(
+        owned = (
             Notification.id == notification_id,
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type()
-        ).first()
+            Notification.recipient_type == self.RECIPIENT_TYPE
+        )
         
-        if notification:
-            notification.soft_delete()
-            self.db.commit()
+        # Conditional UPDATE; RETURNING tells us whether the row was still unread
+        was_read = self.db.execute(
+            update(Notification)
+            .where(*owned, Notification.is_deleted == False)
+            .values(is_deleted=True)
+            .returning(Notification.is_read)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        self.db.commit()
+        
+        if was_read is not None:
+            if not was_read:
+                self._adjust_unread_cache(recipient_id, -1)
             return True
-        return False
+        # Deleting an already deleted notification still succeeds
+        return self.db.query(self.db.query(Notification).filter(*owned).exists()).scalar()
     
     def mark_all_as_read(self, recipient_id: int) -> int:
         """Mark all unread notifications as read. Returns count of updated notifications."""
-        notifications = self.db.query(Notification).filter(
+        # Single UPDATE ... WHERE instead of loading and flushing each row
+        count = self.db.query(Notification).filter(
             Notification.recipient_id == recipient_id,
-            Notification.recipient_type == self.get_recipient_type(),
+            Notification.recipient_type == self.RECIPIENT_TYPE,
             Notification.is_read == False,
             Notification.is_deleted == False
-        ).all()
+        ).update(
+            {Notification.is_read: True, Notification.read_at: datetime.now(timezone.utc)},
+            synchronize_session=False
+        )
         
-        count = 0
-        current_time = datetime.utcnow()
-        for notification in notifications:
-            notification.is_read = True
-            notification.read_at = current_time
-            count += 1
-            
         self.db.commit()
+        self._set_unread_cache(recipient_id, 0)
         return count
     
+    def _unread_cache_key(self, recipient_id: int) -> str:
+        return f"notif:unread:{self.RECIPIENT_TYPE.value}:{recipient_id}"
+    
+    def _adjust_unread_cache(self, recipient_id: int, delta: int) -> None:
+        """Shift a cached unread count; cache errors never fail the caller"""
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            r.eval(_ADJUST_IF_CACHED, 1, self._unread_cache_key(recipient_id), delta)
+        except Exception as e:
+            print(f"Warning: Unread count cache update failed: {e}")
+    
+    def _set_unread_cache(self, recipient_id: int, count: int) -> None:
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            r.setex(self._unread_cache_key(recipient_id), UNREAD_COUNT_TTL, count)
+        except Exception as e:
+            print(f"Warning: Unread count cache update failed: {e}")
+    
     def _post_send_hook(self, notification: Notification) -> None:
         """
         Hook method for subclasses to implement additional logic after sending.
@@ -242,8 +386,7 @@ class NotificationService(ABC):
 class UserNotificationService(NotificationService):
     """Notification service for regular users"""
     
-    def get_recipient_type(self) -> RecipientTypeEnum:
-        return RecipientTypeEnum.USER
+    RECIPIENT_TYPE = RecipientTypeEnum.USER
     
     def _post_send_hook(self, notification: Notification) -> None:
         """User-specific post-send logic"""
@@ -275,8 +418,7 @@ class UserNotificationService(NotificationService):
 class LawyerNotificationService(NotificationService):
     """Notification service for lawyers"""
     
-    def get_recipient_type(self) -> RecipientTypeEnum:
-        return RecipientTypeEnum.LAWYER
+    RECIPIENT_TYPE = RecipientTypeEnum.LAWYER
     
     def _post_send_hook(self, notification: Notification) -> None:
         """Lawyer-specific post-send logic"""
@@ -337,8 +479,7 @@ class LawyerNotificationService(NotificationService):
 class AdminNotificationService(NotificationService):
     """Notification service for administrators (future extensibility)"""
     
-    def get_recipient_type(self) -> RecipientTypeEnum:
-        return RecipientTypeEnum.ADMIN
+    RECIPIENT_TYPE = RecipientTypeEnum.ADMIN
     
     def send_system_alert(
         self, 
@@ -0,0 +1,38 @@
+"""
+Shared Redis client
+Optional cache / pub-sub backend; every caller falls back to the database
+when REDIS_URL is unset or the redis package isn't installed
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import redis
+except ImportError:
+    # Fallback if redis not installed
+    redis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Optional["redis.Redis"]:
+    """Get the process-wide Redis client, or None when Redis isn't configured"""
+    if not REDIS_URL or redis is None:
+        return None
+    return redis.Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+
+
+def new_pubsub_client() -> Optional["redis.Redis"]:
+    """Create a dedicated client for pub/sub, whose reads block without a timeout"""
+    if not REDIS_URL or redis is None:
+        return None
+    return redis.Redis.from_url(REDIS_URL, socket_connect_timeout=REDIS_SOCKET_TIMEOUT)
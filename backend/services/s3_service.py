@@ -7,34 +7,64 @@ Implements stream-to-cloud architecture with SHA-256 hashing and AES-256 encrypt
 
 import hashlib
 import logging
-from typing import Optional
+import threading
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from config import settings
+from services.redis_client import get_redis
 
 logger = logging.getLogger(__name__)
 
+# boto3 clients are thread-safe, so one client (and its connection pool) is
+# shared by every S3 operation in the process
+_S3_CLIENT = None
+_S3_CLIENT_LOCK = threading.Lock()
+
+# Presigned URLs are reused for at most this long, so a cached URL always
+# has nearly its full expiration left when handed out
+PRESIGNED_URL_CACHE_TTL = 60
+
+# Large uploads go out as 8MB multipart chunks so memory stays bounded, with
+# parts uploaded in parallel over their own connections
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=settings.S3_UPLOAD_CONCURRENCY,
+    use_threads=True
+)
+
 
 def get_s3_client():
     """
-    Initialize and return a boto3 S3 client with s3v4 signature version.
+    Return the shared boto3 S3 client with s3v4 signature version,
+    creating it on first use.
     
     Returns:
         boto3.client: Configured S3 client
     """
-    s3_config = Config(
-        signature_version=settings.S3_SIGNATURE_VERSION,
-        region_name=settings.AWS_REGION
-    )
-    
-    return boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        config=s3_config
-    )
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        with _S3_CLIENT_LOCK:
+            if _S3_CLIENT is None:
+                s3_config = Config(
+                    signature_version=settings.S3_SIGNATURE_VERSION,
+                    region_name=settings.AWS_REGION,
+                    # Enough pooled connections for every parallel multipart part
+                    max_pool_connections=max(10, settings.S3_UPLOAD_CONCURRENCY)
+                )
+                
+                _S3_CLIENT = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    config=s3_config
+                )
+    return _S3_CLIENT
 
 
 def calculate_sha256(content: bytes) -> str:
@@ -47,21 +77,42 @@ def calculate_sha256(content: bytes) -> str:
     Returns:
         str: Hexadecimal SHA-256 hash
     """
-    sha256_hash = hashlib.sha256()
-    sha256_hash.update(content)
-    return sha256_hash.hexdigest()
+    # Hash the whole buffer in one call so OpenSSL's (SHA-NI when available)
+    # loop runs over it without Python-side chunking
+    return hashlib.sha256(content).hexdigest()
+
+
+class _HashingReader:
+    """
+    File-like wrapper that feeds every chunk read into a SHA-256 hash.
+    
+    It deliberately doesn't expose seek(), so boto3 treats it as a
+    non-seekable stream and reads it exactly once, in order. boto3 reads
+    in multipart-chunk sized pieces (8MB), far above the ~64KB needed to
+    amortize each update() call into OpenSSL.
+    """
+    
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._fileobj.read(size)
+        self.sha256.update(chunk)
+        return chunk
 
 
 def upload_file_to_s3(
-    file_content: bytes,
+    file_content: Union[bytes, BinaryIO],
     file_key: str,
     content_type: Optional[str] = None
 ) -> str:
     """
-    Upload file to S3 with AES-256 server-side encryption.
+    Stream a file to S3 with AES-256 server-side encryption, hashing it
+    on the way through.
     
     Args:
-        file_content: File content as bytes
+        file_content: File content as bytes or a binary file-like object
         file_key: S3 object key (path in bucket)
         content_type: MIME type of the file
         
@@ -73,23 +124,26 @@ def upload_file_to_s3(
     """
     s3_client = get_s3_client()
     
-    # Calculate hash before upload
-    file_hash = calculate_sha256(file_content)
+    if isinstance(file_content, bytes):
+        file_content = BytesIO(file_content)
+    reader = _HashingReader(file_content)
     
     try:
         # Upload with AES-256 encryption
-        put_params = {
-            'Bucket': settings.S3_BUCKET_NAME,
-            'Key': file_key,
-            'Body': file_content,
-            'ServerSideEncryption': 'AES256'
-        }
+        extra_args = {'ServerSideEncryption': 'AES256'}
         
         if content_type:
-            put_params['ContentType'] = content_type
-        
-        s3_client.put_object(**put_params)
+            extra_args['ContentType'] = content_type
+        
+        s3_client.upload_fileobj(
+            reader,
+            settings.S3_BUCKET_NAME,
+            file_key,
+            ExtraArgs=extra_args,
+            Config=_TRANSFER_CONFIG
+        )
         
+        file_hash = reader.sha256.hexdigest()
         logger.info(f"Successfully uploaded file to S3: {file_key} (hash: {file_hash})")
         return file_hash
         
@@ -112,6 +166,16 @@ def generate_presigned_url(file_key: str, expiration: int = 900) -> str:
     Raises:
         Exception: If URL generation fails
     """
+    r = get_redis()
+    cache_key = f"s3url:{file_key}:{expiration}"
+    if r is not None:
+        try:
+            url = r.get(cache_key)
+            if url:
+                return url
+        except Exception as e:
+            logger.warning(f"Presigned URL cache read failed for {file_key}: {str(e)}")
+    
     s3_client = get_s3_client()
     
     try:
@@ -125,6 +189,13 @@ def generate_presigned_url(file_key: str, expiration: int = 900) -> str:
         )
         
         logger.info(f"Generated presigned URL for {file_key} (expires in {expiration}s)")
+        
+        cache_ttl = min(PRESIGNED_URL_CACHE_TTL, expiration // 4)
+        if r is not None and cache_ttl > 0:
+            try:
+                r.setex(cache_key, cache_ttl, url)
+            except Exception as e:
+                logger.warning(f"Presigned URL cache write failed for {file_key}: {str(e)}")
         return url
         
     except ClientError as e:
@@ -3,17 +3,39 @@ WebSocket Notification Manager
 Handles real-time notification delivery to frontend clients
 """
 
-import json
+import orjson
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple, Union
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from models.notification import RecipientTypeEnum, Notification
+from services.redis_client import get_redis, new_pubsub_client
 from datetime import datetime
 import asyncio
+import threading
+import time
+from concurrent.futures import Future
 
 logger = logging.getLogger(__name__)
 
+# Long-lived loop for pushing notifications from sync request handlers, so a
+# send doesn't pay for a fresh thread and event loop every time
+_bg_loop = asyncio.new_event_loop()
+threading.Thread(target=_bg_loop.run_forever, daemon=True, name="ws-notify-loop").start()
+
+# Upper bound on messages coalesced into one "batch" frame
+MAX_BATCH_SIZE = 32
+
+# Redis channel every worker listens on, so a notification reaches the client
+# whichever process holds its socket
+NOTIFICATION_CHANNEL = "notif.channel"
+
+USER_TYPE_MAPPING = {
+    RecipientTypeEnum.USER: "user",
+    RecipientTypeEnum.LAWYER: "lawyer",
+    RecipientTypeEnum.ADMIN: "admin"
+}
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time notifications"""
@@ -25,6 +47,10 @@ class ConnectionManager:
             "lawyer": {},
             "admin": {}
         }
+        # Per-connection outbound queue and the task draining it
+        self._outboxes: Dict[Tuple[str, int], Tuple[asyncio.Queue, asyncio.Task]] = {}
+        # Loop that owns the sockets; sends from other loops are handed over to it
+        self._loop: asyncio.AbstractEventLoop = None
     
     async def connect(self, websocket: WebSocket, user_type: str, user_id: int):
         """Accept a new WebSocket connection"""
@@ -40,8 +66,13 @@ class ConnectionManager:
                 await self.active_connections[user_type][user_id].close()
             except:
                 pass
+            self._close_outbox(user_type, user_id)
         
         self.active_connections[user_type][user_id] = websocket
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        task = asyncio.create_task(self._drain(websocket, queue, user_type, user_id))
+        self._outboxes[(user_type, user_id)] = (queue, task)
         logger.info(f"WebSocket connected: {user_type}:{user_id}")
         
         # Send connection confirmation
@@ -56,63 +87,78 @@ class ConnectionManager:
             user_id in self.active_connections[user_type]):
             del self.active_connections[user_type][user_id]
             logger.info(f"WebSocket disconnected: {user_type}:{user_id}")
+        self._close_outbox(user_type, user_id)
     
-    async def send_personal_message(self, message: dict, user_type: str, user_id: int):
-        """Send message to a specific user"""
-        if (user_type in self.active_connections and 
-            user_id in self.active_connections[user_type]):
+    def _close_outbox(self, user_type: str, user_id: int):
+        outbox = self._outboxes.pop((user_type, user_id), None)
+        if outbox and outbox[1] is not asyncio.current_task():
+            outbox[1].cancel()
+    
+    async def _drain(self, websocket: WebSocket, queue: asyncio.Queue, user_type: str, user_id: int):
+        """Send queued messages, coalescing bursts into a single batch frame"""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < MAX_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            if len(batch) == 1:
+                payload = batch[0]
+            else:
+                payload = '{"type":"batch","items":[' + ",".join(batch) + ']}'
+            
             try:
-                websocket = self.active_connections[user_type][user_id]
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(payload)
             except Exception as e:
                 logger.error(f"Failed to send WebSocket message to {user_type}:{user_id}: {e}")
                 # Remove the connection if it's broken
-                self.disconnect(user_type, user_id)
+                if self.active_connections.get(user_type, {}).get(user_id) is websocket:
+                    self.disconnect(user_type, user_id)
+                return
+    
+    def _enqueue(self, payload: str, user_type: str, user_id: int):
+        outbox = self._outboxes.get((user_type, user_id))
+        if outbox is not None:
+            outbox[0].put_nowait(payload)
+    
+    def enqueue_threadsafe(self, payload: str, user_type: str, user_id: int):
+        """Queue a pre-encoded message from any thread"""
+        if self._loop is not None:
+            # asyncio.Queue isn't thread-safe; enqueue on the socket's own loop
+            self._loop.call_soon_threadsafe(self._enqueue, payload, user_type, user_id)
+    
+    async def send_personal_message(self, message: Union[dict, str], user_type: str, user_id: int):
+        """Queue message for a specific user (a str is treated as pre-encoded JSON)"""
+        payload = message if isinstance(message, str) else orjson.dumps(message).decode()
+        if asyncio.get_running_loop() is self._loop:
+            self._enqueue(payload, user_type, user_id)
+        else:
+            self.enqueue_threadsafe(payload, user_type, user_id)
     
     async def broadcast_to_user_type(self, message: dict, user_type: str):
         """Broadcast message to all users of a specific type"""
         if user_type in self.active_connections:
-            disconnect_list = []
-            
-            for user_id, websocket in self.active_connections[user_type].items():
-                try:
-                    await websocket.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to {user_type}:{user_id}: {e}")
-                    disconnect_list.append(user_id)
-            
-            # Remove broken connections
-            for user_id in disconnect_list:
-                self.disconnect(user_type, user_id)
+            payload = orjson.dumps(message).decode()
+            # Each connection's drain task stays the only writer to its socket,
+            # so a broadcast is batched with anything else queued for it and a
+            # slow client can't stall the rest; broken sockets are dropped there
+            enqueue = (self._enqueue if asyncio.get_running_loop() is self._loop
+                       else self.enqueue_threadsafe)
+            for user_id in list(self.active_connections[user_type]):
+                enqueue(payload, user_type, user_id)
     
     async def send_notification(self, notification: Notification):
         """Send a notification via WebSocket"""
-        user_type_mapping = {
-            RecipientTypeEnum.USER: "user",
-            RecipientTypeEnum.LAWYER: "lawyer",
-            RecipientTypeEnum.ADMIN: "admin"
-        }
-        
-        user_type = user_type_mapping.get(notification.recipient_type)
+        user_type = USER_TYPE_MAPPING.get(notification.recipient_type)
         if not user_type:
             return
         
-        message = {
-            "type": "notification",
-            "data": {
-                "id": str(notification.id),
-                "title": notification.title,
-                "message": notification.message,
-                "notification_type": notification.type.value,
-                "priority": notification.priority,
-                "action_url": notification.action_url,
-                "created_at": notification.created_at.isoformat(),
-                "is_read": notification.is_read,
-                "metadata": json.loads(notification.metadata_json) if notification.metadata_json else None
-            }
-        }
-        
-        await self.send_personal_message(message, user_type, notification.recipient_id)
+        await self.send_personal_message(
+            notification_message(notification), user_type, notification.recipient_id
+        )
+    
+    async def send_notifications(self, notifications: List[Notification]):
+        """Send several notifications via WebSocket concurrently"""
+        await asyncio.gather(*(self.send_notification(n) for n in notifications))
     
     def get_connection_count(self) -> Dict[str, int]:
         """Get the number of active connections by user type"""
@@ -122,10 +168,92 @@ class ConnectionManager:
         }
 
 
+def notification_message(notification: Notification) -> dict:
+    """Build the websocket payload for a notification"""
+    return {
+        "type": "notification",
+        "data": {
+            "id": str(notification.id),
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.type,
+            "priority": notification.priority,
+            "action_url": notification.action_url,
+            "created_at": notification.created_at,
+            "is_read": notification.is_read,
+            "metadata": notification.metadata_json
+        }
+    }
+
+
 # Global connection manager instance
 notification_manager = ConnectionManager()
 
 
 def get_notification_manager() -> ConnectionManager:
     """Get the global notification manager instance"""
-    return notification_manager
\ No newline at end of file
+    return notification_manager
+
+
+def _log_dispatch_error(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"WebSocket send error: {future.exception()}")
+
+
+def dispatch(coro) -> Future:
+    """Schedule a coroutine on the shared background notification loop"""
+    future = asyncio.run_coroutine_threadsafe(coro, _bg_loop)
+    future.add_done_callback(_log_dispatch_error)
+    return future
+
+
+def publish_notifications(notifications: List[Notification]) -> None:
+    """
+    Fan notifications out to the websocket clients.
+    
+    With Redis configured they're published to every worker; otherwise they
+    are delivered from this process's own connections.
+    """
+    r = get_redis()
+    if r is None:
+        dispatch(notification_manager.send_notifications(notifications))
+        return
+    
+    try:
+        with r.pipeline(transaction=False) as pipe:
+            for notification in notifications:
+                user_type = USER_TYPE_MAPPING.get(notification.recipient_type)
+                if not user_type:
+                    continue
+                pipe.publish(NOTIFICATION_CHANNEL, orjson.dumps({
+                    "user_type": user_type,
+                    "user_id": notification.recipient_id,
+                    "payload": orjson.dumps(notification_message(notification)).decode()
+                }))
+            pipe.execute()
+    except Exception as e:
+        # Still reach the clients connected to this worker
+        logger.error(f"Failed to publish notifications, delivering locally: {e}")
+        dispatch(notification_manager.send_notifications(notifications))
+
+
+def _listen_for_notifications() -> None:
+    while True:
+        try:
+            pubsub = new_pubsub_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(NOTIFICATION_CHANNEL)
+            for item in pubsub.listen():
+                event = orjson.loads(item["data"])
+                notification_manager.enqueue_threadsafe(
+                    event["payload"], event["user_type"], event["user_id"]
+                )
+        except Exception as e:
+            logger.error(f"Notification subscriber error, reconnecting: {e}")
+            time.sleep(1)
+
+
+def start_notification_subscriber() -> None:
+    """Start relaying published notifications to this worker's connections"""
+    if get_redis() is None:
+        return
+    threading.Thread(target=_listen_for_notifications, daemon=True, name="ws-notify-sub").start()
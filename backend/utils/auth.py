@@ -16,7 +16,7 @@ def hash_password(password: str) -> str:
     # Pre-hash with SHA256 to handle any length password (avoids bcrypt 72-byte limit)
     prehash = hashlib.sha256(password.encode('utf-8')).hexdigest()
     # Bcrypt hash the SHA256 hex string
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(prehash.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -137,3 +137,11 @@ def update_password_history(user, new_hash: str):
     # Add new hash and keep only last 5
     history.append(new_hash)
     user.password_history = json.dumps(history[-5:])
+
+
+# MFA Backup Codes
+def generate_backup_codes(count: int = 10) -> list[str]:
+    """Generate single-use MFA backup codes (8 uppercase hex chars each)"""
+    # One entropy draw sliced into codes; 32 bits per code
+    pool = secrets.token_hex(4 * count).upper()
+    return [pool[i:i + 8] for i in range(0, 8 * count, 8)]
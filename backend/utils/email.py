@@ -1,6 +1,12 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import asyncio
+import html
+import re
+from email import policy
+from email.message import EmailMessage
+from functools import lru_cache
+from string import Template
+from typing import Optional
+import aiosmtplib
 from config import settings
 import logging
 import os
@@ -8,9 +14,99 @@ import os
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, html_content: str):
+# Settings are fixed for the process, so these are computed once at import
+_EMAIL_FROM_HEADER = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5174")
+
+# SMTP policy emits CRLF line endings up front, so the flattened bytes go out
+# without a second end-of-line rewrite; lines are only folded at the RFC 5322
+# hard limit (998) so long URLs don't trigger folding work on every send
+_MESSAGE_POLICY = policy.SMTP.clone(max_line_length=998)
+
+# Same mapping as html.escape(quote=True), applied in a single str.translate pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+class _SMTPPool:
+    """
+    Small pool of long-lived, authenticated aiosmtplib connections.
+    The TCP + TLS + AUTH handshake is paid once per connection and amortized
+    across every email sent through it, instead of once per email.
+    """
+    
+    def __init__(self, size: int):
+        self._size = max(1, size)
+        self._idle: Optional[asyncio.Queue] = None
+        self._lock = asyncio.Lock()
+    
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=settings.SMTP_USE_TLS,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD
+        )
+        await client.connect()  # Performs STARTTLS and login
+        return client
+    
+    async def send(self, message: EmailMessage) -> None:
+        async with self._lock:
+            if self._idle is None:
+                # Slots start empty and connect on first use
+                self._idle = asyncio.Queue()
+                for _ in range(self._size):
+                    self._idle.put_nowait(None)
+        
+        client = await self._idle.get()
+        try:
+            if client is None or not client.is_connected:
+                client = await self._connect()
+            try:
+                await client.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Server closed an idle connection; reconnect once and retry
+                client = await self._connect()
+                await client.send_message(message)
+        except Exception:
+            client = None
+            raise
+        finally:
+            self._idle.put_nowait(client)
+
+
+_smtp_pool = _SMTPPool(settings.SMTP_POOL_SIZE)
+
+
+_LINK_RE = re.compile(r'<a\s[^>]*href="([^"]+)"[^>]*>(.*?)</a>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _link_to_text(match: "re.Match[str]") -> str:
+    url, label = match.group(1), " ".join(match.group(2).split())
+    return url if label == url else f"{label}: {url}"
+
+
+@lru_cache(maxsize=1024)
+def _text_from_html(html_content: str) -> str:
+    """Derive the plain-text alternative for an HTML email (cached per rendered body)"""
+    text = _TAG_RE.sub("", _LINK_RE.sub(_link_to_text, html_content))
+    lines = [line.strip() for line in html.unescape(text).splitlines()]
+    # Collapse runs of blank lines left behind by the markup
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+async def send_email(to_email: str, subject: str, html_content: str):
     """
     Send an email using SMTP settings from config.
+    Runs as a FastAPI background task on the event loop, sending over a
+    pooled SMTP connection.
     """
     try:
         if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
@@ -18,119 +114,113 @@ def send_email(to_email: str, subject: str, html_content: str):
             logger.info(f"Would have sent email to {to_email} with subject: {subject}")
             return
 
-        message = MIMEMultipart("alternative")
+        message = EmailMessage(policy=_MESSAGE_POLICY)
         message["Subject"] = subject
-        message["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+        message["From"] = _EMAIL_FROM_HEADER
         message["To"] = to_email
 
-        # Attach HTML content
-        part = MIMEText(html_content, "html")
-        message.attach(part)
+        # Plain-text part first so clients that can't render HTML still get
+        # the message; quoted-printable keeps the mostly-ASCII HTML readable
+        # and avoids the ~33% size overhead of base64
+        message.set_content(_text_from_html(html_content))
+        message.add_alternative(html_content, subtype="html", cte="quoted-printable")
 
-        # Connect to server
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            if settings.SMTP_USE_TLS:
-                server.starttls()
-            
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.EMAIL_FROM, to_email, message.as_string())
+        await _smtp_pool.send(message)
             
         logger.info(f"Email sent successfully to {to_email}")
 
     except Exception as e:
         logger.error(f"Failed to send email to {to_email}: {e}")
-        # Don't raise the exception to avoid crashing the request
-        # In production, you might want to use a background task for emails
+        # Don't raise the exception to avoid crashing the background task
 
 
-def send_verification_email(email: str, token: str, user_name: str):
-    """Send account verification email"""
-    subject = "Verify your SentiLex Account"
-    
-    # Get frontend URL from environment variable
-    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5174")
-    verify_url = f"{frontend_url}/verify-email?token={token}"
-    
-    html_content = f"""
+# Email Templates
+# The shared <html><body> wrapper is built once at import; each kind only
+# contributes its content block, substituted per send
+_BASE_PREFIX = """
     <html>
         <body>
-            <h2>Hello {user_name},</h2>
+"""
+
+_BASE_SUFFIX = """        </body>
+    </html>
+    """
+
+_CONTENT_BLOCKS = {
+    "verify": Template("""            <h2>Hello $user_name,</h2>
             <p>Welcome to SentiLex AI Advocate.</p>
             <p>Please verify your email address by clicking the link below:</p>
-            <p><a href="{verify_url}">Verify Email</a></p>
+            <p><a href="$verify_url">Verify Email</a></p>
             <p>This link will expire in 24 hours.</p>
             <br>
             <p>If you did not create an account, please ignore this email.</p>
-        </body>
-    </html>
-    """
-    
-    send_email(email, subject, html_content)
-
-
-def send_password_reset_email(email: str, token: str, user_name: str):
-    """Send password reset email"""
-    subject = "Reset your Password - SentiLex"
-
-    # Get frontend URL from environment variable
-    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5174")
-    reset_url = f"{frontend_url}/reset-password?token={token}"
-    
-    html_content = f"""
-    <html>
-        <body>
-            <h2>Hello {user_name},</h2>
+"""),
+    "password_reset": Template("""            <h2>Hello $user_name,</h2>
             <p>We received a request to reset your password.</p>
             <p>Click the link below to choose a new password:</p>
-            <p><a href="{reset_url}">Reset Password</a></p>
+            <p><a href="$reset_url">Reset Password</a></p>
             <p>This link will expire in 1 hour.</p>
             <br>
             <p>If you did not request a password reset, please ignore this email.</p>
-        </body>
-    </html>
-    """
-    
-    send_email(email, subject, html_content)
-
-
-def send_password_changed_email(email: str, user_name: str, ip_address: str, timestamp: str):
-    """Send notification that password was changed"""
-    subject = "Security Alert: Password Changed"
-    
-    html_content = f"""
-    <html>
-        <body>
-            <h2>Hello {user_name},</h2>
+"""),
+    "password_changed": Template("""            <h2>Hello $user_name,</h2>
             <p>Your password was successfully changed.</p>
-            <p><strong>Time:</strong> {timestamp}</p>
-            <p><strong>IP Address:</strong> {ip_address}</p>
+            <p><strong>Time:</strong> $timestamp</p>
+            <p><strong>IP Address:</strong> $ip_address</p>
             <br>
             <p>If verify this was you, no further action is needed.</p>
             <p>If you did NOT change your password, please contact support immediately.</p>
-        </body>
-    </html>
-    """
-    
-    send_email(email, subject, html_content)
+"""),
+    "welcome": Template("""            <h2>Welcome $user_name!</h2>
+            <p>Your email has been verified.</p>
+            <p>You can now log in to your account and access all features.</p>
+            <p><a href="$login_url">Go to Login</a></p>
+"""),
+}
 
 
-def send_welcome_email(email: str, user_name: str):
-    """Send welcome email after verification"""
-    subject = "Welcome to SentiLex AI Advocate!"
+def render_email(kind: str, **values: str) -> str:
+    """Render an email body; every substituted value is HTML-escaped"""
+    escaped = {key: value.translate(_HTML_ESCAPE_TABLE) for key, value in values.items()}
+    return _BASE_PREFIX + _CONTENT_BLOCKS[kind].substitute(escaped) + _BASE_SUFFIX
 
-    # Get frontend URL from environment variable
-    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5174")
-    login_url = f"{frontend_url}/dashboard"
 
-    html_content = f"""
-    <html>
-        <body>
-            <h2>Welcome {user_name}!</h2>
-            <p>Your email has been verified.</p>
-            <p>You can now log in to your account and access all features.</p>
-            <p><a href="{login_url}">Go to Login</a></p>
-        </body>
-    </html>
-    """
-    
-    send_email(email, subject, html_content)
+async def send_verification_email(email: str, token: str, user_name: str):
+    """Send account verification email"""
+    html_content = render_email(
+        "verify",
+        user_name=user_name,
+        verify_url=f"{FRONTEND_URL}/verify-email?token={token}"
+    )
+    await send_email(email, "Verify your SentiLex Account", html_content)
+
+
+async def send_password_reset_email(email: str, token: str, user_name: str):
+    """Send password reset email"""
+    html_content = render_email(
+        "password_reset",
+        user_name=user_name,
+        reset_url=f"{FRONTEND_URL}/reset-password?token={token}"
+    )
+    await send_email(email, "Reset your Password - SentiLex", html_content)
+
+
+async def send_password_changed_email(email: str, user_name: str, ip_address: str, timestamp: str):
+    """Send notification that password was changed"""
+    html_content = render_email(
+        "password_changed",
+        user_name=user_name,
+        ip_address=ip_address,
+        timestamp=timestamp
+    )
+    await send_email(email, "Security Alert: Password Changed", html_content)
+
+
+async def send_welcome_email(email: str, user_name: str):
+    """Send welcome email after verification"""
+    html_content = render_email(
+        "welcome",
+        user_name=user_name,
+        login_url=f"{FRONTEND_URL}/dashboard"
+    )
+    await send_email(email, "Welcome to SentiLex AI Advocate!", html_content)
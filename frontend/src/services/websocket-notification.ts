@@ -8,10 +8,12 @@ import { API_CONFIG, APP_CONFIG } from "../config";
 export interface WebSocketMessage {
   type:
     | "notification"
+    | "batch"
     | "connection_established"
     | "pong"
     | "mark_as_read_response";
   data?: any;
+  items?: WebSocketMessage[];
   message?: string;
   notification_id?: string;
   success?: boolean;
@@ -124,6 +126,11 @@ class WebSocketNotificationService {
         }
         break;
 
+      case "batch":
+        // Bursts are coalesced server-side into a single frame
+        message.items?.forEach((item) => this.handleMessage(item));
+        break;
+
       case "mark_as_read_response":
         this.emit("mark_as_read_response", {
           success: message.success,